@@ -19,6 +19,91 @@ class Settings(BaseSettings):
     # Set to "true" in production (Railway/Render), "false" locally for visible browser
     browser_headless: str = "false"
 
+    # NotebookLM source uploads (concurrency and per-source retries)
+    notebooklm_upload_concurrency: int = 4
+    notebooklm_upload_max_attempts: int = 3
+    notebooklm_upload_retry_base_delay_seconds: float = 2.0
+    notebooklm_upload_retry_max_delay_seconds: float = 30.0
+
+    # NotebookLM source bundling (items packed into a few large text sources)
+    notebooklm_bundle_sources: bool = True
+    notebooklm_max_sources: int = 8
+    notebooklm_max_source_bytes: int = 400_000
+
+    # NotebookLM client pool (open clients reused per user)
+    notebooklm_client_pool_max_clients: int = 20
+    notebooklm_client_idle_ttl_seconds: float = 900.0
+
+    # NotebookLM audio jobs (persisted, resumed after restarts)
+    notebooklm_audio_max_concurrent_waits: int = 4
+    notebooklm_audio_timeout_seconds: float = 1200.0
+    notebooklm_audio_max_attempts: int = 3
+    notebooklm_audio_retry_delay_seconds: float = 30.0
+
+    # Outbound HTTP clients (shared, pooled per service)
+    rss_timeout_seconds: float = 15.0
+    rss_max_connections: int = 50
+    rss_max_keepalive_connections: int = 20
+    rss_fetch_concurrency: int = 16
+    rss_per_host_concurrency: int = 2
+    rss_cache_max_entries: int = 5000
+    rss_max_entries_per_feed: int = 5
+    rss_max_new_entries_per_feed: int = 3
+    rss_max_feed_bytes: int = 5_000_000
+    rss_streaming_parser: bool = True
+
+    # Feed circuit breaker
+    feed_breaker_failure_threshold: int = 3
+    feed_breaker_base_backoff_minutes: int = 30
+    feed_breaker_max_backoff_minutes: int = 24 * 60
+    feed_health_refresh_seconds: int = 60  # Re-read persisted state older than this
+    feed_health_idle_seconds: int = 2 * 24 * 60 * 60  # Forget feeds nobody fetched for this long
+
+    # Feed parsing worker pool ("thread" or "process")
+    feed_parse_executor: str = "thread"
+    feed_parse_workers: int = 4
+    feed_parse_queue_size: int = 64
+    perplexity_timeout_seconds: float = 60.0
+    perplexity_max_connections: int = 10
+
+    # Perplexity quota (process-wide token bucket) and per-generation topic concurrency
+    perplexity_requests_per_minute: int = 50
+    perplexity_burst: int = 10
+    perplexity_topic_concurrency: int = 4
+
+    # Retries for transient Perplexity errors (429 / 5xx / timeouts)
+    perplexity_max_attempts: int = 4
+    perplexity_retry_base_delay_seconds: float = 1.0
+    perplexity_retry_max_delay_seconds: float = 30.0
+    perplexity_retry_budget_per_run: int = 100
+
+    # Stream synthesis completions: total budget and max gap between chunks
+    perplexity_stream_synthesis: bool = True
+    perplexity_stream_total_seconds: float = 180.0
+    perplexity_stream_idle_seconds: float = 30.0
+
+    # Perplexity prices (USD) for cost estimates when the API doesn't report cost
+    perplexity_search_cost_per_request: float = 0.005
+    perplexity_completion_cost_per_request: float = 0.005
+    perplexity_input_cost_per_million_tokens: float = 1.0
+    perplexity_output_cost_per_million_tokens: float = 1.0
+
+    # New results (not in the user's feeds or an earlier topic) a topic needs to be included
+    perplexity_min_results_per_topic: int = 1
+
+    # Synthesize several of a user's topics in one completion
+    perplexity_batch_synthesis: bool = False
+    perplexity_batch_size: int = 4
+
+    # Cross-user topic result cache
+    topic_cache_ttl_seconds: int = 4 * 60 * 60
+    topic_cache_max_entries: int = 2000
+    topic_cache_empty_ttl_seconds: int = 10 * 60  # "No recent news" results
+
+    # Persistent memo of syntheses keyed by search-result fingerprint
+    synthesis_memo_max_entries: int = 2000
+    synthesis_memo_retention_days: int = 7
+
     class Config:
         env_file = ".env"
 
@@ -1,15 +1,39 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.routers import auth, sources, generation, preferences, admin
 from app.config import get_settings
+from app.services.http_clients import http_clients
+from app.services.feed_parser_pool import feed_parse_pool
+from app.services.notebooklm_auth import notebooklm_client_pool
+from app.services.audio_jobs import audio_jobs
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: open shared outbound HTTP connection pools, parse workers and the idle NotebookLM client sweep
+    http_clients.start()
+    feed_parse_pool.start()
+    notebooklm_client_pool.start()
+    # Pick up audio generations interrupted by the last shutdown
+    audio_jobs.resume()
+    yield
+    # Shutdown: close pooled connections cleanly (unfinished audio jobs resume on next startup)
+    await audio_jobs.shutdown()
+    await http_clients.aclose()
+    await notebooklm_client_pool.close_all()
+    await feed_parse_pool.shutdown()
+
+
 app = FastAPI(
     title="DailyBrief API",
     description="Personalized daily podcast generator",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Dict, List
+from datetime import datetime, timedelta
 
 from app.config import get_settings, Settings
 from app.services.supabase import get_current_user
 from app.services import db
+from app.services.audio_jobs import audio_jobs
+from app.services.feed_cache import feed_cache
+from app.services.feed_parser_pool import feed_parse_pool
+from app.services.notebooklm_auth import notebooklm_client_pool
+from app.services.perplexity import get_perplexity_limiter, synthesis_flights
+from app.services.synthesis_memo import synthesis_memo
+from app.services.topic_cache import topic_cache
 
 router = APIRouter()
 
@@ -133,6 +140,8 @@ async def get_usage_data(
             "scheduled_at": gen["scheduled_at"],
             "status": gen["status"],
             "notebook_id": gen.get("notebook_id"),
+            "audio_status": gen.get("audio_status"),
+            "audio_url": gen.get("audio_url"),
             "sources_used": gen.get("sources_used"),
             "error_message": gen.get("error_message"),
             "daily_generation_enabled": prefs.get("daily_generation_enabled", False),
@@ -146,3 +155,109 @@ async def get_usage_data(
         "total_users": len(set(g["user_id"] for g in usage_data)),
         "generations": usage_data,
     }
+
+
+@router.get("/perplexity-usage")
+async def get_perplexity_usage(
+    days: int = Query(7, ge=1, le=90),
+    admin_user_id: str = Depends(require_admin),
+    settings: Settings = Depends(get_settings),
+):
+    """
+    Get Perplexity requests, tokens and estimated cost per user per day,
+    plus the most expensive users and topics, over the last `days` days.
+    Admin only endpoint.
+    """
+    from app.services.supabase import get_supabase_client
+    client = get_supabase_client(settings)
+
+    since = datetime.utcnow() - timedelta(days=days)
+    generations = []
+    page_size = 1000  # PostgREST caps rows per response
+    while True:
+        response = (
+            client.table("generation_logs")
+            .select("user_id, created_at, perplexity_usage")
+            .gte("created_at", since.isoformat())
+            .not_.is_("perplexity_usage", "null")
+            .order("created_at")
+            .range(len(generations), len(generations) + page_size - 1)
+            .execute()
+        )
+        generations.extend(response.data)
+        if len(response.data) < page_size:
+            break
+
+    users_response = client.auth.admin.list_users()
+    users_map = {user.id: user.email for user in users_response}
+
+    def empty_totals() -> Dict:
+        return {"generations": 0, "requests": 0, "errors": 0, "total_tokens": 0, "cost_usd": 0.0, "latency_ms_total": 0}
+
+    by_user_day: Dict[tuple, Dict] = {}
+    by_user: Dict[str, Dict] = {}
+    by_topic: Dict[str, Dict] = {}
+
+    for gen in generations:
+        usage = gen["perplexity_usage"]
+        day = gen["created_at"][:10]
+        for totals in (
+            by_user_day.setdefault((gen["user_id"], day), empty_totals()),
+            by_user.setdefault(gen["user_id"], empty_totals()),
+        ):
+            totals["generations"] += 1
+            for field in ("requests", "errors", "total_tokens", "cost_usd", "latency_ms_total"):
+                totals[field] += usage.get(field, 0)
+
+        for topic, topic_usage in usage.get("topics", {}).items():
+            totals = by_topic.setdefault(topic, {"requests": 0, "total_tokens": 0, "cost_usd": 0.0})
+            for field in totals:
+                totals[field] += topic_usage.get(field, 0)
+
+    return {
+        "since": since.isoformat() + "Z",
+        "total_cost_usd": round(sum(totals["cost_usd"] for totals in by_user.values()), 4),
+        "daily": [
+            {
+                "user_id": user_id,
+                "user_email": users_map.get(user_id, "Unknown"),
+                "date": day,
+                **totals,
+                "cost_usd": round(totals["cost_usd"], 4),
+            }
+            for (user_id, day), totals in sorted(by_user_day.items(), key=lambda item: (item[0][1], item[0][0]), reverse=True)
+        ],
+        "top_users": [
+            {
+                "user_id": user_id,
+                "user_email": users_map.get(user_id, "Unknown"),
+                **totals,
+                "cost_usd": round(totals["cost_usd"], 4),
+            }
+            for user_id, totals in sorted(by_user.items(), key=lambda item: item[1]["cost_usd"], reverse=True)[:20]
+        ],
+        "top_topics": [
+            {"topic": topic, **totals, "cost_usd": round(totals["cost_usd"], 4)}
+            for topic, totals in sorted(by_topic.items(), key=lambda item: item[1]["cost_usd"], reverse=True)[:20]
+        ],
+    }
+
+
+@router.get("/stats")
+async def get_runtime_stats(
+    admin_user_id: str = Depends(require_admin),
+):
+    """
+    Get in-process runtime stats (caches, pools) for this server instance.
+    Admin only endpoint.
+    """
+    return {
+        "feed_cache": feed_cache.stats(),
+        "feed_parse_pool": feed_parse_pool.stats(),
+        "perplexity_limiter": get_perplexity_limiter().stats(),
+        "topic_cache": topic_cache.stats(),
+        "synthesis_memo": synthesis_memo.stats(),
+        "synthesis_flights": synthesis_flights.stats(),
+        "notebooklm_client_pool": notebooklm_client_pool.stats(),
+        "audio_jobs": audio_jobs.stats(),
+    }
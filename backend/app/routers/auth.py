@@ -143,7 +143,7 @@ async def upload_notebooklm_credentials(
         }
     }
     """
-    from app.services.notebooklm_auth import notebooklm_auth
+    from app.services.notebooklm_auth import notebooklm_auth, notebooklm_client_pool
     import json
     from pathlib import Path
 
@@ -184,6 +184,9 @@ async def upload_notebooklm_credentials(
         }
         notebooklm_auth._auth_cache[user_id] = metadata
 
+        # Pooled clients were built from the old credentials
+        await notebooklm_client_pool.invalidate(user_id)
+
         print(f"[UPLOAD] Successfully uploaded credentials for user: {user_id}")
 
         return {
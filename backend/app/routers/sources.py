@@ -1,18 +1,81 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Response
+from typing import List, Dict
 
 from app.config import get_settings, Settings
 from app.schemas.sources import (
     RSSSource,
     RSSSourceCreate,
+    RSSSourceBatchCreate,
+    RSSSourceBatchResult,
+    BatchToggle,
+    BatchDelete,
+    DEFAULT_VALIDATE_FEEDS,
     NewsTopic,
     NewsTopicCreate,
+    NewsTopicBatchCreate,
 )
 from app.services.supabase import get_current_user
 from app.services import db
+from app.services.feed_health import feed_health
+from app.services.feed_urls import resolve_feed_key
+from app.services.opml import OPMLError, build_opml, parse_opml
+from app.services.rss import fetch_feeds_with_report
 
 router = APIRouter()
 
+# Limits for bulk operations
+MAX_BATCH_SIZE = 500
+MAX_OPML_BYTES = 2_000_000
+
+
+async def _create_rss_sources(
+    user_id: str,
+    candidates: List[Dict[str, str]],
+    validate_feeds: bool,
+) -> Dict:
+    """
+    Add many RSS sources for a user with a single insert.
+
+    Skips URLs the user already follows (compared by canonical feed URL)
+    and, when validate_feeds is set, feeds that can't be fetched; those
+    are fetched concurrently under the usual feed fetch limits.
+    """
+    if len(candidates) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many sources (max {MAX_BATCH_SIZE} per request)",
+        )
+
+    existing = {resolve_feed_key(s["url"]) for s in db.get_rss_sources(user_id)}
+    to_add = []
+    skipped = []
+
+    for candidate in candidates:
+        url = candidate["url"].strip()
+        if not url.startswith(("http://", "https://")):
+            skipped.append({"url": url, "reason": "Not an http(s) URL"})
+            continue
+        key = resolve_feed_key(url)
+        if key in existing:
+            skipped.append({"url": url, "reason": "Already added"})
+            continue
+        existing.add(key)
+        to_add.append({"url": url, "name": candidate.get("name") or url})
+
+    if validate_feeds and to_add:
+        reports = await fetch_feeds_with_report([source["url"] for source in to_add])
+        valid = []
+        for source in to_add:
+            error = reports[source["url"]]["error"]
+            if error:
+                skipped.append({"url": source["url"], "reason": error})
+            else:
+                valid.append(source)
+        to_add = valid
+
+    created = db.add_rss_sources(user_id, to_add)
+    return {"created": created, "skipped": skipped}
+
 
 # ============ RSS Sources ============
 
@@ -21,8 +84,14 @@ async def get_rss_sources(
     user_id: str = Depends(get_current_user),
     settings: Settings = Depends(get_settings),
 ):
-    """Get all RSS sources for the current user."""
-    return db.get_rss_sources(user_id)
+    """Get all RSS sources for the current user, with each feed's health."""
+    sources = db.get_rss_sources(user_id)
+
+    feed_health.load([s["url"] for s in sources])
+    for source in sources:
+        source["health"] = feed_health.get(source["url"])
+
+    return sources
 
 
 @router.post("/rss", response_model=RSSSource)
@@ -35,6 +104,72 @@ async def create_rss_source(
     return db.add_rss_source(user_id, source.url, source.name)
 
 
+@router.post("/rss/batch", response_model=RSSSourceBatchResult)
+async def create_rss_sources_batch(
+    batch: RSSSourceBatchCreate,
+    user_id: str = Depends(get_current_user),
+    settings: Settings = Depends(get_settings),
+):
+    """Add many RSS feed sources at once."""
+    candidates = [{"url": source.url, "name": source.name} for source in batch.sources]
+    return await _create_rss_sources(user_id, candidates, batch.validate_feeds)
+
+
+@router.post("/rss/batch/toggle", response_model=List[RSSSource])
+async def toggle_rss_sources_batch(
+    batch: BatchToggle,
+    user_id: str = Depends(get_current_user),
+    settings: Settings = Depends(get_settings),
+):
+    """Enable or disable many RSS sources at once."""
+    return db.set_rss_sources_enabled(user_id, batch.ids, batch.enabled)
+
+
+@router.post("/rss/batch/delete")
+async def delete_rss_sources_batch(
+    batch: BatchDelete,
+    user_id: str = Depends(get_current_user),
+    settings: Settings = Depends(get_settings),
+):
+    """Delete many RSS sources at once."""
+    deleted = db.delete_rss_sources(user_id, batch.ids)
+    return {"message": "Sources deleted", "deleted": deleted}
+
+
+@router.post("/rss/import/opml", response_model=RSSSourceBatchResult)
+async def import_opml(
+    file: UploadFile = File(...),
+    validate_feeds: bool = DEFAULT_VALIDATE_FEEDS,
+    user_id: str = Depends(get_current_user),
+    settings: Settings = Depends(get_settings),
+):
+    """Import RSS sources from an OPML file exported by another feed reader."""
+    content = await file.read(MAX_OPML_BYTES + 1)
+    if len(content) > MAX_OPML_BYTES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="OPML file too large")
+
+    try:
+        candidates = parse_opml(content)
+    except OPMLError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return await _create_rss_sources(user_id, candidates, validate_feeds)
+
+
+@router.get("/rss/export/opml")
+async def export_opml(
+    user_id: str = Depends(get_current_user),
+    settings: Settings = Depends(get_settings),
+):
+    """Export the current user's RSS sources as an OPML file."""
+    opml = build_opml(db.get_rss_sources(user_id))
+    return Response(
+        content=opml,
+        media_type="text/x-opml",
+        headers={"Content-Disposition": 'attachment; filename="dailybrief-feeds.opml"'},
+    )
+
+
 @router.delete("/rss/{source_id}")
 async def delete_rss_source(
     source_id: str,
@@ -67,6 +202,51 @@ async def create_news_topic(
     return db.add_news_topic(user_id, topic.topic)
 
 
+@router.post("/topics/batch", response_model=List[NewsTopic])
+async def create_news_topics_batch(
+    batch: NewsTopicBatchCreate,
+    user_id: str = Depends(get_current_user),
+    settings: Settings = Depends(get_settings),
+):
+    """Add many news topics at once, skipping ones already tracked."""
+    if len(batch.topics) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many topics (max {MAX_BATCH_SIZE} per request)",
+        )
+
+    existing = {t["topic"].strip().lower() for t in db.get_news_topics(user_id)}
+    topics = []
+    for topic in batch.topics:
+        topic = topic.strip()
+        if topic and topic.lower() not in existing:
+            existing.add(topic.lower())
+            topics.append(topic)
+
+    return db.add_news_topics(user_id, topics)
+
+
+@router.post("/topics/batch/toggle", response_model=List[NewsTopic])
+async def toggle_news_topics_batch(
+    batch: BatchToggle,
+    user_id: str = Depends(get_current_user),
+    settings: Settings = Depends(get_settings),
+):
+    """Enable or disable many news topics at once."""
+    return db.set_news_topics_enabled(user_id, batch.ids, batch.enabled)
+
+
+@router.post("/topics/batch/delete")
+async def delete_news_topics_batch(
+    batch: BatchDelete,
+    user_id: str = Depends(get_current_user),
+    settings: Settings = Depends(get_settings),
+):
+    """Delete many news topics at once."""
+    deleted = db.delete_news_topics(user_id, batch.ids)
+    return {"message": "Topics deleted", "deleted": deleted}
+
+
 @router.delete("/topics/{topic_id}")
 async def delete_news_topic(
     topic_id: str,
@@ -1,5 +1,16 @@
 from pydantic import BaseModel, HttpUrl
-from typing import Optional, Dict
+from typing import Optional, Dict, List
+from datetime import datetime
+
+
+class FeedHealth(BaseModel):
+    status: str = "healthy"  # healthy, degraded, open (being skipped)
+    consecutive_failures: int = 0
+    last_latency_ms: Optional[float] = None
+    last_success_at: Optional[datetime] = None
+    last_failure_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    next_retry_at: Optional[datetime] = None
 
 
 class RSSSource(BaseModel):
@@ -8,6 +19,7 @@ class RSSSource(BaseModel):
     url: str
     name: str
     enabled: bool = True
+    health: Optional[FeedHealth] = None
 
 
 class RSSSourceCreate(BaseModel):
@@ -15,6 +27,35 @@ class RSSSourceCreate(BaseModel):
     name: str
 
 
+# Whether bulk adds (batch create, OPML import) fetch each new feed first
+# and skip the ones that can't be fetched or parsed
+DEFAULT_VALIDATE_FEEDS = True
+
+
+class RSSSourceBatchCreate(BaseModel):
+    sources: List[RSSSourceCreate]
+    validate_feeds: bool = DEFAULT_VALIDATE_FEEDS  # Skip feeds that fail to fetch; reported in `skipped`
+
+
+class SkippedSource(BaseModel):
+    url: str
+    reason: str
+
+
+class RSSSourceBatchResult(BaseModel):
+    created: List[RSSSource]
+    skipped: List[SkippedSource] = []
+
+
+class BatchToggle(BaseModel):
+    ids: List[str]
+    enabled: bool
+
+
+class BatchDelete(BaseModel):
+    ids: List[str]
+
+
 class NewsTopic(BaseModel):
     id: str
     user_id: str
@@ -24,3 +65,7 @@ class NewsTopic(BaseModel):
 
 class NewsTopicCreate(BaseModel):
     topic: str
+
+
+class NewsTopicBatchCreate(BaseModel):
+    topics: List[str]
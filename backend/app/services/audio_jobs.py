@@ -0,0 +1,239 @@
+"""
+Durable NotebookLM audio-generation jobs.
+
+Audio overviews take several minutes to generate after a generation is
+marked complete. Each one is tracked as a row in the audio_jobs table and
+waited on by a background task that the tracker keeps a reference to, so
+its outcome (status, audio_url, generation time) is written back to
+generation_logs instead of being lost.
+
+Unfinished jobs are picked up again on startup (see app/main.py). A job
+whose NotebookLM task had already started resumes waiting on that task
+rather than generating the audio again. At most
+settings.notebooklm_audio_max_concurrent_waits jobs wait at once; the
+rest queue. Jobs are owned by a single app process.
+"""
+
+import asyncio
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from app.config import get_settings
+
+
+class AudioJobTracker:
+    """Runs persisted audio jobs with a cap on concurrent waits."""
+
+    def __init__(self, max_concurrent: Optional[int] = None):
+        """
+        Initialize the tracker.
+
+        Args:
+            max_concurrent: Jobs waiting on NotebookLM at once. Defaults to
+                settings.notebooklm_audio_max_concurrent_waits.
+        """
+        self._max_concurrent = max_concurrent
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[str, asyncio.Task] = {}  # generation ID -> running job
+        self._running = 0
+        self._stats = {"submitted": 0, "resumed": 0, "complete": 0, "failed": 0, "timeout": 0, "retries": 0}
+
+    @property
+    def max_concurrent(self) -> int:
+        if self._max_concurrent is None:
+            self._max_concurrent = get_settings().notebooklm_audio_max_concurrent_waits
+        return self._max_concurrent
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    def submit(self, generation_id: str, user_id: str, notebook_id: str, format: str = "deep-dive") -> None:
+        """Record an audio job for a generation and start it in the background."""
+        from app.services import db
+
+        job = {
+            "generation_id": generation_id,
+            "user_id": user_id,
+            "notebook_id": notebook_id,
+            "format": format,
+            "status": "pending",
+            "attempts": 0,
+        }
+        try:
+            job = db.create_audio_job(job)
+        except Exception as e:
+            # Still generate the audio, it just won't survive a restart
+            print(f"[AUDIO JOBS] Failed to store job for generation {generation_id}, running it unpersisted: {str(e)}")
+
+        self._stats["submitted"] += 1
+        self._update_generation(generation_id, {"audio_status": "pending"})
+        self._start(job)
+
+    def resume(self) -> int:
+        """Start every unfinished job in the audio_jobs table. Returns how many were started."""
+        from app.services import db
+
+        try:
+            jobs = db.get_unfinished_audio_jobs()
+        except Exception as e:
+            print(f"[AUDIO JOBS] Failed to load unfinished jobs: {str(e)}")
+            return 0
+
+        resumed = 0
+        for job in jobs:
+            if job["generation_id"] not in self._tasks:
+                self._start(job)
+                resumed += 1
+
+        self._stats["resumed"] += resumed
+        if resumed:
+            print(f"[AUDIO JOBS] Resumed {resumed} unfinished audio jobs")
+        return resumed
+
+    async def shutdown(self) -> None:
+        """Stop waiting. Unfinished jobs stay in the table and resume on the next startup."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start(self, job: Dict[str, Any]) -> None:
+        generation_id = job["generation_id"]
+        task = asyncio.create_task(self._run(job))
+        self._tasks[generation_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(generation_id, None))
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        async with self.semaphore:
+            self._running += 1
+            try:
+                await self._process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[AUDIO JOBS] Job for generation {job['generation_id']} crashed: {str(e)}")
+            finally:
+                self._running -= 1
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        """Generate (or keep waiting for) a job's audio, retrying transient errors."""
+        from app.services import db
+
+        settings = get_settings()
+        if job.get("started_at"):
+            started_at = db.parse_timestamp(job["started_at"])
+        else:
+            started_at = datetime.utcnow()
+            self._update_job(job, {"started_at": started_at.isoformat() + "Z"})
+        deadline = started_at + timedelta(seconds=settings.notebooklm_audio_timeout_seconds)
+
+        while True:
+            remaining = (deadline - datetime.utcnow()).total_seconds()
+            if remaining <= 0:
+                self._finish(job, started_at, "timeout", error="Audio generation timed out. Check NotebookLM app.")
+                return
+
+            attempts = (job.get("attempts") or 0) + 1
+            self._update_job(job, {"status": "generating", "attempts": attempts})
+
+            try:
+                result = await self._attempt(job, remaining)
+            except asyncio.TimeoutError:
+                # The audio may still finish in NotebookLM
+                self._finish(job, started_at, "timeout", error="Audio generation timed out. Check NotebookLM app.")
+                return
+            except Exception as e:
+                delay = settings.notebooklm_audio_retry_delay_seconds
+                if attempts < settings.notebooklm_audio_max_attempts and remaining > delay:
+                    print(f"[AUDIO JOBS] Attempt {attempts} for generation {job['generation_id']} failed, retrying in {delay:.0f}s: {str(e)}")
+                    self._stats["retries"] += 1
+                    self._update_job(job, {"status": "pending", "error": str(e)})
+                    await asyncio.sleep(delay)
+                    continue
+                self._finish(job, started_at, "failed", error=str(e))
+                return
+
+            if result["status"] == "complete":
+                self._finish(job, started_at, "complete", audio_url=result.get("audio_url"))
+            else:
+                self._finish(job, started_at, "failed", error=result.get("error"))
+            return
+
+    async def _attempt(self, job: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """One try: start the NotebookLM task if needed, then wait for it."""
+        from app.services.notebooklm import open_session, start_audio_generation, wait_for_audio
+
+        async with AsyncExitStack() as stack:
+            client = await open_session(stack, job["user_id"])
+            if client is None:
+                return {"status": "error", "error": "User not authenticated with NotebookLM"}
+
+            if not job.get("task_id"):
+                task_id = await start_audio_generation(client, job["notebook_id"], format=job.get("format") or "deep-dive")
+                # Stored so a restart waits on this task instead of starting another
+                self._update_job(job, {"task_id": task_id})
+
+            return await wait_for_audio(client, job["notebook_id"], job["task_id"], timeout=timeout)
+
+    def _finish(
+        self,
+        job: Dict[str, Any],
+        started_at: datetime,
+        status: str,
+        audio_url: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record a job's outcome on the job and its generation log."""
+        completed_at = datetime.utcnow()
+        seconds = round((completed_at - started_at).total_seconds(), 1)
+        print(f"[AUDIO JOBS] Generation {job['generation_id']} audio {status} after {seconds}s" + (f": {error}" if error else ""))
+
+        self._stats[status] += 1
+        self._update_job(job, {
+            "status": status,
+            "audio_url": audio_url,
+            "error": error,
+            "completed_at": completed_at.isoformat() + "Z",
+        })
+        self._update_generation(job["generation_id"], {
+            "audio_status": status,
+            "audio_url": audio_url,
+            "audio_generation_seconds": seconds,
+        })
+
+    def _update_job(self, job: Dict[str, Any], updates: Dict[str, Any]) -> None:
+        job.update(updates)
+        if not job.get("id"):
+            return
+
+        from app.services import db
+
+        try:
+            db.update_audio_job(job["id"], updates)
+        except Exception as e:
+            print(f"[AUDIO JOBS] Failed to update job {job['id']}: {str(e)}")
+
+    def _update_generation(self, generation_id: str, updates: Dict[str, Any]) -> None:
+        from app.services import db
+
+        try:
+            db.update_generation_log(generation_id=generation_id, updates=updates)
+        except Exception as e:
+            print(f"[AUDIO JOBS] Failed to update generation {generation_id}: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return job counts and how many are waiting or queued."""
+        return {
+            **self._stats,
+            "running": self._running,
+            "queued": len(self._tasks) - self._running,
+            "max_concurrent": self.max_concurrent,
+        }
+
+
+# Global instance
+audio_jobs = AudioJobTracker()
@@ -1,6 +1,6 @@
 """Database service for Supabase operations."""
-from typing import List, Dict, Optional
-from datetime import datetime, time
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime, time, timezone
 from supabase import Client
 
 from app.config import get_settings
@@ -13,6 +13,14 @@ def get_db_client() -> Client:
     return get_supabase_client(settings)
 
 
+def parse_timestamp(value: str) -> datetime:
+    """Parse a Supabase timestamp string to a naive UTC datetime."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
 # RSS Sources
 def get_rss_sources(user_id: str) -> List[Dict]:
     """Get all RSS sources for a user."""
@@ -41,6 +49,48 @@ def delete_rss_source(user_id: str, source_id: str) -> bool:
     return True
 
 
+def add_rss_sources(user_id: str, sources: List[Dict]) -> List[Dict]:
+    """Add several RSS sources ({url, name} dicts) in one insert."""
+    if not sources:
+        return []
+    client = get_db_client()
+    data = [
+        {
+            "user_id": user_id,
+            "url": source["url"],
+            "name": source["name"],
+            "enabled": True,
+        }
+        for source in sources
+    ]
+    response = client.table("rss_sources").insert(data).execute()
+    return response.data
+
+
+def set_rss_sources_enabled(user_id: str, source_ids: List[str], enabled: bool) -> List[Dict]:
+    """Enable or disable several RSS sources in one update."""
+    if not source_ids:
+        return []
+    client = get_db_client()
+    response = (
+        client.table("rss_sources")
+        .update({"enabled": enabled, "updated_at": datetime.utcnow().isoformat()})
+        .in_("id", source_ids)
+        .eq("user_id", user_id)
+        .execute()
+    )
+    return response.data
+
+
+def delete_rss_sources(user_id: str, source_ids: List[str]) -> int:
+    """Delete several RSS sources in one request. Returns number deleted."""
+    if not source_ids:
+        return 0
+    client = get_db_client()
+    response = client.table("rss_sources").delete().in_("id", source_ids).eq("user_id", user_id).execute()
+    return len(response.data)
+
+
 # News Topics
 def get_news_topics(user_id: str) -> List[Dict]:
     """Get all news topics for a user."""
@@ -68,6 +118,47 @@ def delete_news_topic(user_id: str, topic_id: str) -> bool:
     return True
 
 
+def add_news_topics(user_id: str, topics: List[str]) -> List[Dict]:
+    """Add several news topics in one insert."""
+    if not topics:
+        return []
+    client = get_db_client()
+    data = [
+        {
+            "user_id": user_id,
+            "topic": topic,
+            "enabled": True,
+        }
+        for topic in topics
+    ]
+    response = client.table("news_topics").insert(data).execute()
+    return response.data
+
+
+def set_news_topics_enabled(user_id: str, topic_ids: List[str], enabled: bool) -> List[Dict]:
+    """Enable or disable several news topics in one update."""
+    if not topic_ids:
+        return []
+    client = get_db_client()
+    response = (
+        client.table("news_topics")
+        .update({"enabled": enabled, "updated_at": datetime.utcnow().isoformat()})
+        .in_("id", topic_ids)
+        .eq("user_id", user_id)
+        .execute()
+    )
+    return response.data
+
+
+def delete_news_topics(user_id: str, topic_ids: List[str]) -> int:
+    """Delete several news topics in one request. Returns number deleted."""
+    if not topic_ids:
+        return 0
+    client = get_db_client()
+    response = client.table("news_topics").delete().in_("id", topic_ids).eq("user_id", user_id).execute()
+    return len(response.data)
+
+
 # User Preferences
 def get_user_preferences(user_id: str) -> Optional[Dict]:
     """Get user preferences."""
@@ -204,6 +295,151 @@ def get_users_with_daily_generation_enabled() -> List[Dict]:
     return response.data
 
 
+# Feed Entry Archive
+# Entry keys per archive lookup; keeps the GET URL (sha256 keys are ~75
+# characters each) well under proxy URL length limits
+FEED_ENTRY_LOOKUP_CHUNK = 40
+
+
+def get_feed_entries(pairs: List[Tuple[str, str]]) -> List[Dict]:
+    """Get archived entries for exact (feed URL, entry key) pairs, in chunked requests."""
+    wanted = set(pairs)
+    if not wanted:
+        return []
+    client = get_db_client()
+    # Sorted so each chunk covers as few feeds as possible
+    ordered = sorted(wanted)
+    rows = {}
+    for start in range(0, len(ordered), FEED_ENTRY_LOOKUP_CHUNK):
+        chunk = ordered[start:start + FEED_ENTRY_LOOKUP_CHUNK]
+        response = (
+            client.table("feed_entries")
+            .select("feed_url, entry_key, first_seen_at")
+            .in_("feed_url", sorted({feed_url for feed_url, _ in chunk}))
+            .in_("entry_key", sorted({entry_key for _, entry_key in chunk}))
+            .execute()
+        )
+        # The filters match every feed x key combination; keep the requested pairs
+        for row in response.data:
+            pair = (row["feed_url"], row["entry_key"])
+            if pair in wanted:
+                rows[pair] = row
+    return list(rows.values())
+
+
+def add_feed_entries(entries: List[Dict]) -> List[Dict]:
+    """Archive feed entries in one insert, skipping ones already stored."""
+    if not entries:
+        return []
+    client = get_db_client()
+    response = (
+        client.table("feed_entries")
+        .upsert(entries, on_conflict="feed_url,entry_key", ignore_duplicates=True)
+        .execute()
+    )
+    return response.data
+
+
+def get_generation_cursor(user_id: str) -> Optional[Dict]:
+    """Get the user's last successful generation cursor."""
+    client = get_db_client()
+    response = client.table("generation_cursors").select("*").eq("user_id", user_id).execute()
+    return response.data[0] if response.data else None
+
+
+def update_generation_cursor(user_id: str, generation_id: str, generated_at: datetime) -> Dict:
+    """Move the user's cursor to a successful generation."""
+    client = get_db_client()
+    data = {
+        "user_id": user_id,
+        "last_generation_id": generation_id,
+        "last_generated_at": generated_at.isoformat() + "Z",
+        "updated_at": datetime.utcnow().isoformat(),
+    }
+    response = client.table("generation_cursors").upsert(data, on_conflict="user_id").execute()
+    return response.data[0]
+
+
+# Feed Health
+def get_feed_health(feed_urls: List[str]) -> List[Dict]:
+    """Get health records for the given (canonical) feed URLs."""
+    if not feed_urls:
+        return []
+    client = get_db_client()
+    response = client.table("feed_health").select("*").in_("feed_url", feed_urls).execute()
+    return response.data
+
+
+def upsert_feed_health(records: List[Dict]) -> List[Dict]:
+    """Insert or update feed health records in one request."""
+    if not records:
+        return []
+    client = get_db_client()
+    response = client.table("feed_health").upsert(records, on_conflict="feed_url").execute()
+    return response.data
+
+
+# Synthesis Memo
+def get_synthesis_memos(fingerprints: List[str], since: datetime) -> List[Dict]:
+    """Get memoized syntheses for the given fingerprints created after `since`."""
+    if not fingerprints:
+        return []
+    client = get_db_client()
+    response = (
+        client.table("synthesis_memo")
+        .select("fingerprint, summary, created_at")
+        .in_("fingerprint", fingerprints)
+        .gte("created_at", since.isoformat())
+        .execute()
+    )
+    return response.data
+
+
+def add_synthesis_memos(records: List[Dict]) -> List[Dict]:
+    """Store memoized syntheses in one request (existing fingerprints are replaced)."""
+    if not records:
+        return []
+    client = get_db_client()
+    response = client.table("synthesis_memo").upsert(records, on_conflict="fingerprint").execute()
+    return response.data
+
+
+def delete_synthesis_memos_before(cutoff: datetime) -> int:
+    """Delete memoized syntheses older than `cutoff`. Returns number deleted."""
+    client = get_db_client()
+    response = client.table("synthesis_memo").delete().lt("created_at", cutoff.isoformat()).execute()
+    return len(response.data)
+
+
+# Audio Jobs
+def create_audio_job(job: Dict) -> Dict:
+    """Create an audio generation job."""
+    client = get_db_client()
+    response = client.table("audio_jobs").insert(job).execute()
+    return response.data[0]
+
+
+def get_unfinished_audio_jobs() -> List[Dict]:
+    """Get audio jobs that haven't finished (oldest first)."""
+    client = get_db_client()
+    response = (
+        client.table("audio_jobs")
+        .select("*")
+        .in_("status", ["pending", "generating"])
+        .order("created_at")
+        .execute()
+    )
+    return response.data
+
+
+def update_audio_job(job_id: str, updates: Dict) -> Dict:
+    """Update an audio generation job."""
+    client = get_db_client()
+    data = {**updates, "updated_at": datetime.utcnow().isoformat()}
+    response = client.table("audio_jobs").update(data).eq("id", job_id).execute()
+    return response.data[0] if response.data else None
+
+
 # NotebookLM Credentials
 def get_notebooklm_credentials(user_id: str) -> Optional[Dict]:
     """Get NotebookLM credentials for a user."""
@@ -0,0 +1,160 @@
+"""
+Persistent feed-entry archive and per-user "since last run" selection.
+
+Every fetched entry is archived once per feed, keyed by its GUID (or a
+content hash when the feed has none), with the time we first saw it.
+Feeds are keyed by resolve_feed_key() like everywhere else; entries
+archived under a feed's own URL before a redirect was known are still
+recognized (and moved to the redirect target's key).
+
+Each user has a cursor recording their last successful generation, so a
+generation only uses entries first seen since then, instead of resending
+whatever happens to be at the top of the feed. Feeds the user subscribed
+to after that generation are treated like a first generation.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services import db
+from app.services.feed_urls import canonicalize_feed_url, resolve_feed_key
+
+
+def entry_key(entry: Dict[str, Any]) -> str:
+    """Stable identity for an entry: its GUID, or a hash of its content."""
+    guid = (entry.get("guid") or "").strip()
+    if guid:
+        return f"guid:{guid}"
+
+    fingerprint = "\n".join(
+        " ".join((entry.get(field) or "").split())
+        for field in ("title", "link", "summary", "content")
+    )
+    return "sha256:" + hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+def archive_entries(rss_entries: Dict[str, List[Dict[str, Any]]]) -> Dict[Tuple[str, str], datetime]:
+    """
+    Store fetched entries in the archive.
+
+    Uses indexed lookups (chunked to keep requests small) for the entries
+    already archived and one bulk insert for the rest. Entries are looked up under both the feed's
+    resolved key and its own canonical URL, so learning (or forgetting, on
+    restart) a redirect doesn't make the whole feed look new; entries only
+    found under the old key are re-archived under the resolved one.
+
+    Returns dict mapping (feed key, entry key) -> first seen time.
+    """
+    wanted = {}
+    aliases: Dict[str, set] = {}  # Resolved feed key -> every key it may be archived under
+    for url, entries in rss_entries.items():
+        feed_key = resolve_feed_key(url)
+        aliases.setdefault(feed_key, {feed_key}).add(canonicalize_feed_url(url))
+        for entry in entries:
+            wanted[(feed_key, entry_key(entry))] = entry
+
+    if not wanted:
+        return {}
+
+    existing = db.get_feed_entries([
+        (alias, key)
+        for feed_key, key in wanted
+        for alias in aliases[feed_key]
+    ])
+    archived = {
+        (row["feed_url"], row["entry_key"]): db.parse_timestamp(row["first_seen_at"])
+        for row in existing
+    }
+
+    now = datetime.utcnow()
+    first_seen = {}
+    new_rows = []
+    for (feed_key, key), entry in wanted.items():
+        if (feed_key, key) in archived:
+            first_seen[(feed_key, key)] = archived[(feed_key, key)]
+            continue
+        seen_at = min(
+            (archived[(alias, key)] for alias in aliases[feed_key] if (alias, key) in archived),
+            default=now,
+        )
+        first_seen[(feed_key, key)] = seen_at
+        new_rows.append({
+            "feed_url": feed_key,
+            "entry_key": key,
+            "title": entry.get("title", ""),
+            "link": entry.get("link", ""),
+            "published_at": entry.get("published"),
+            "first_seen_at": seen_at.isoformat() + "Z",
+        })
+
+    db.add_feed_entries(new_rows)
+    print(f"[ARCHIVE] {len(wanted)} entries checked, {len(new_rows)} newly archived")
+
+    return first_seen
+
+
+def select_new_entries(
+    user_id: str,
+    rss_entries: Dict[str, List[Dict[str, Any]]],
+    max_new_per_feed: int,
+    subscribed_at: Optional[Dict[str, datetime]] = None,
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Optional[datetime]]:
+    """
+    Keep only entries the user hasn't had in a previous generation.
+
+    Entries first seen after the user's cursor are new; up to
+    `max_new_per_feed` of them are kept per feed (newest first), and feeds
+    with nothing new are dropped. Without a cursor (first generation) the
+    newest entry of each feed is used, and so is it for feeds subscribed to
+    after the cursor (`subscribed_at`: feed URL -> subscription time), whose
+    entries may have been archived long ago for other users.
+
+    Returns (selected entries by feed URL, cursor time to save once the
+    generation succeeds). If the archive is unavailable, falls back to the
+    newest entry per feed and returns None as the cursor.
+    """
+    newest_only = {url: entries[:1] for url, entries in rss_entries.items() if entries}
+
+    try:
+        cursor = db.get_generation_cursor(user_id)
+        first_seen = archive_entries(rss_entries)
+    except Exception as e:
+        print(f"[ARCHIVE] Archive unavailable, using newest entry per feed: {str(e)}")
+        return newest_only, None
+
+    # Everything archived so far was seen at or before this moment
+    archived_at = datetime.utcnow()
+
+    if not cursor or not cursor.get("last_generated_at"):
+        return newest_only, archived_at
+
+    since = db.parse_timestamp(cursor["last_generated_at"])
+
+    selected = {}
+    for url, entries in rss_entries.items():
+        if subscribed_at and url in subscribed_at and subscribed_at[url] > since:
+            # New to this user: the archive says nothing about what they've had
+            if entries:
+                selected[url] = entries[:1]
+            continue
+
+        feed_key = resolve_feed_key(url)
+        fresh = [
+            entry for entry in entries
+            if first_seen.get((feed_key, entry_key(entry)), archived_at) > since
+        ]
+        if fresh:
+            selected[url] = fresh[:max_new_per_feed]
+
+    return selected, archived_at
+
+
+def advance_cursor(user_id: str, generation_id: str, archived_at: Optional[datetime]) -> None:
+    """Record a successful generation so its entries aren't sent again."""
+    if archived_at is None:
+        return
+    try:
+        db.update_generation_cursor(user_id, generation_id, archived_at)
+    except Exception as e:
+        print(f"[ARCHIVE] Failed to update generation cursor for user {user_id}: {str(e)}")
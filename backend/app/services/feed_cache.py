@@ -0,0 +1,112 @@
+"""
+Conditional GET cache for RSS feeds.
+
+Stores the HTTP validators (ETag / Last-Modified) and the last parsed
+entries per feed URL, so an unchanged feed can be revalidated with a
+304 instead of being downloaded and parsed again.
+
+The cache is in-memory, per process, and bounded (least recently used
+feeds are evicted first).
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.config import get_settings
+
+
+class FeedCache:
+    """LRU cache of feed validators and parsed entries keyed by URL."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of feeds to keep. Defaults to
+                settings.rss_cache_max_entries.
+        """
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0}
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is None:
+            self._max_entries = get_settings().rss_cache_max_entries
+        return self._max_entries
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached record for a feed and count it as a hit or miss.
+
+        Returns dict with etag, last_modified and entries, or None.
+        """
+        cached = self._entries.get(url)
+        if cached is None:
+            self._stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(url)
+        self._stats["hits"] += 1
+        return cached
+
+    @staticmethod
+    def conditional_headers(cached: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a cached feed."""
+        headers = {}
+        if not cached:
+            return headers
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def record_not_modified(self) -> None:
+        """Count a 304 response served from the cache."""
+        self._stats["not_modified"] += 1
+
+    def store(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        entries: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Remember validators and parsed entries for a feed.
+
+        Feeds that send neither validator can't be revalidated, so they
+        are dropped rather than stored.
+        """
+        if not etag and not last_modified:
+            self._entries.pop(url, None)
+            return
+
+        self._entries[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "entries": entries,
+        }
+        self._entries.move_to_end(url)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop all cached feeds (stats are kept)."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/304 counters and current size."""
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+
+# Global instance
+feed_cache = FeedCache()
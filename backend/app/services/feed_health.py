@@ -0,0 +1,189 @@
+"""
+Per-feed health tracking and circuit breaker.
+
+Records consecutive failures, latency and last success for every feed.
+After settings.feed_breaker_failure_threshold consecutive failures a
+feed's circuit opens: fetches are skipped (instead of burning the full
+timeout for every subscriber) until a retry time that backs off
+exponentially with each further failure. The first fetch after that time
+is a trial; success closes the circuit again.
+
+State lives in memory and is persisted to the feed_health table, loaded
+and flushed in bulk around each batch of fetches. Loaded state older than
+settings.feed_health_refresh_seconds is re-read, so changes made by other
+workers (or before a restart) are picked up, and feeds nobody has fetched
+for settings.feed_health_idle_seconds (no longer subscribed; subscribed
+feeds are fetched at least daily) are dropped from memory.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import get_settings
+from app.services import db
+from app.services.feed_urls import resolve_feed_key
+
+
+class FeedHealthTracker:
+    """Health state and circuit breaker for feeds, keyed by canonical URL."""
+
+    def __init__(self):
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._dirty: set = set()
+        self._loaded_at: Dict[str, float] = {}  # feed key -> when its state was last read
+        self._used_at: Dict[str, float] = {}  # feed key -> when it was last loaded or updated
+
+    def _new_state(self, feed_key: str) -> Dict[str, Any]:
+        return {
+            "feed_url": feed_key,
+            "status": "healthy",
+            "consecutive_failures": 0,
+            "last_latency_ms": None,
+            "last_success_at": None,
+            "last_failure_at": None,
+            "last_error": None,
+            "next_retry_at": None,
+        }
+
+    def _state(self, url: str) -> Dict[str, Any]:
+        feed_key = resolve_feed_key(url)
+        if feed_key not in self._states:
+            self._states[feed_key] = self._new_state(feed_key)
+        self._used_at[feed_key] = time.monotonic()
+        return self._states[feed_key]
+
+    def load(self, urls: List[str]) -> None:
+        """
+        Load persisted state for feeds not in memory or loaded too long ago (one query).
+
+        State with unsaved changes is kept as is.
+        """
+        settings = get_settings()
+        now = time.monotonic()
+        keys = {resolve_feed_key(url) for url in urls}
+        for feed_key in keys:
+            self._used_at[feed_key] = now
+        self._evict_idle(now - settings.feed_health_idle_seconds)
+
+        stale = sorted(
+            feed_key for feed_key in keys
+            if feed_key not in self._dirty
+            and now - self._loaded_at.get(feed_key, float("-inf")) > settings.feed_health_refresh_seconds
+        )
+        if not stale:
+            return
+
+        try:
+            rows = db.get_feed_health(stale)
+        except Exception as e:
+            print(f"[FEED HEALTH] Failed to load feed health: {str(e)}")
+            return
+
+        for feed_key in stale:
+            self._loaded_at[feed_key] = now
+
+        for row in rows:
+            state = self._new_state(row["feed_url"])
+            for field in state:
+                if row.get(field) is not None:
+                    state[field] = row[field]
+            for field in ("last_success_at", "last_failure_at", "next_retry_at"):
+                if isinstance(state[field], str):
+                    state[field] = db.parse_timestamp(state[field])
+            self._states[row["feed_url"]] = state
+
+    def allow(self, url: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check whether a feed should be fetched now.
+
+        Returns (allowed, reason). An open circuit past its retry time lets
+        exactly one trial fetch through and pushes the retry time out, so
+        concurrent callers don't all pile onto a dead feed.
+        """
+        state = self._state(url)
+        if state["status"] != "open":
+            return True, None
+
+        now = datetime.utcnow()
+        if state["next_retry_at"] and now < state["next_retry_at"]:
+            return False, f"Feed circuit open after {state['consecutive_failures']} failures; retry after {state['next_retry_at'].isoformat()}Z"
+
+        state["next_retry_at"] = now + self._backoff(state["consecutive_failures"])
+        self._dirty.add(state["feed_url"])
+        return True, None
+
+    def _backoff(self, failures: int) -> timedelta:
+        settings = get_settings()
+        exponent = max(failures - settings.feed_breaker_failure_threshold, 0)
+        minutes = settings.feed_breaker_base_backoff_minutes * (2 ** min(exponent, 16))
+        return timedelta(minutes=min(minutes, settings.feed_breaker_max_backoff_minutes))
+
+    def record_success(self, url: str, latency_ms: float) -> None:
+        state = self._state(url)
+        state.update({
+            "status": "healthy",
+            "consecutive_failures": 0,
+            "last_latency_ms": latency_ms,
+            "last_success_at": datetime.utcnow(),
+            "next_retry_at": None,
+        })
+        self._dirty.add(state["feed_url"])
+
+    def record_failure(self, url: str, latency_ms: float, error: str) -> None:
+        settings = get_settings()
+        state = self._state(url)
+        now = datetime.utcnow()
+
+        state["consecutive_failures"] += 1
+        state["last_latency_ms"] = latency_ms
+        state["last_failure_at"] = now
+        state["last_error"] = error
+
+        if state["consecutive_failures"] >= settings.feed_breaker_failure_threshold:
+            state["status"] = "open"
+            state["next_retry_at"] = now + self._backoff(state["consecutive_failures"])
+            print(f"[FEED HEALTH] Circuit open for {state['feed_url']} until {state['next_retry_at'].isoformat()}Z")
+        else:
+            state["status"] = "degraded"
+
+        self._dirty.add(state["feed_url"])
+
+    def _evict_idle(self, cutoff: float) -> None:
+        """Drop saved state for feeds not used since `cutoff`."""
+        idle = [
+            feed_key for feed_key, used_at in self._used_at.items()
+            if used_at < cutoff and feed_key not in self._dirty
+        ]
+        for feed_key in idle:
+            self._states.pop(feed_key, None)
+            self._loaded_at.pop(feed_key, None)
+            del self._used_at[feed_key]
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get a feed's health (None if never fetched)."""
+        return self._states.get(resolve_feed_key(url))
+
+    def flush(self) -> None:
+        """Persist changed state in one bulk upsert."""
+        if not self._dirty:
+            return
+
+        records = []
+        for feed_key in self._dirty:
+            record = dict(self._states[feed_key])
+            for field in ("last_success_at", "last_failure_at", "next_retry_at"):
+                if record[field] is not None:
+                    record[field] = record[field].isoformat() + "Z"
+            record["updated_at"] = datetime.utcnow().isoformat()
+            records.append(record)
+
+        try:
+            db.upsert_feed_health(records)
+            self._dirty.clear()
+        except Exception as e:
+            print(f"[FEED HEALTH] Failed to save feed health: {str(e)}")
+
+
+# Global instance
+feed_health = FeedHealthTracker()
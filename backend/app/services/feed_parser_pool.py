@@ -0,0 +1,100 @@
+"""
+Worker pool for feed parsing.
+
+feedparser is synchronous and CPU-bound; running it inside an async
+request handler blocks the event loop for every other request and
+generation. This pool runs parsing in a thread or process pool instead,
+with a bounded queue so a burst of large feeds applies back-pressure
+rather than piling up unbounded work.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import get_settings
+
+
+def _timed_call(func: Callable[[Any], Any], arg: Any) -> Tuple[Any, float]:
+    """Run func(arg) in the worker and return (result, seconds spent)."""
+    started = time.perf_counter()
+    result = func(arg)
+    return result, time.perf_counter() - started
+
+
+class FeedParsePool:
+    """Bounded thread/process pool for running parse functions off the event loop."""
+
+    def __init__(self):
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._stats = {"parsed": 0, "queue_wait_ms_total": 0.0, "parse_ms_total": 0.0}
+
+    def start(self) -> None:
+        """Create the executor from settings (no-op if already running)."""
+        if self._executor is not None:
+            return
+
+        settings = get_settings()
+        workers = settings.feed_parse_workers
+
+        if settings.feed_parse_executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-parse")
+
+        # Running + queued jobs; callers beyond this wait before submitting
+        self._slots = asyncio.Semaphore(workers + settings.feed_parse_queue_size)
+
+        print(f"[PARSE] Started {settings.feed_parse_executor} pool with {workers} workers")
+
+    async def run(self, func: Callable[[Any], Any], arg: Any) -> Tuple[Any, Dict[str, float]]:
+        """
+        Run func(arg) in the pool.
+
+        func must be a module-level function when using a process pool.
+
+        Returns (result, timings) where timings has queue_wait_ms (time
+        waiting for a slot and a free worker) and parse_ms.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+
+        async with self._slots:
+            result, parse_seconds = await loop.run_in_executor(self._executor, _timed_call, func, arg)
+
+        total_ms = (time.perf_counter() - started) * 1000
+        parse_ms = parse_seconds * 1000
+        queue_wait_ms = max(total_ms - parse_ms, 0.0)
+
+        self._stats["parsed"] += 1
+        self._stats["queue_wait_ms_total"] += queue_wait_ms
+        self._stats["parse_ms_total"] += parse_ms
+
+        return result, {"queue_wait_ms": round(queue_wait_ms, 1), "parse_ms": round(parse_ms, 1)}
+
+    async def shutdown(self) -> None:
+        """Stop the executor, dropping queued work (waits for running parses off the event loop)."""
+        if self._executor is None:
+            return
+        executor = self._executor
+        self._executor = None
+        self._slots = None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        print("[PARSE] Stopped parse pool")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return parse counts and average queue wait / parse time."""
+        parsed = self._stats["parsed"]
+        return {
+            "parsed": parsed,
+            "avg_queue_wait_ms": round(self._stats["queue_wait_ms_total"] / parsed, 1) if parsed else 0.0,
+            "avg_parse_ms": round(self._stats["parse_ms_total"] / parsed, 1) if parsed else 0.0,
+            "running": self._executor is not None,
+        }
+
+
+# Global instance
+feed_parse_pool = FeedParsePool()
@@ -0,0 +1,77 @@
+"""
+Per-run feed resolution for scheduled generations.
+
+Many users follow the same popular feeds. Instead of every user's
+generation fetching and parsing them separately, a FeedResolver is created
+once per scheduled run: it canonicalizes feed URLs and fetches each unique
+feed once, handing the same parsed result to every subscriber.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from app.services.feed_health import feed_health
+from app.services.feed_urls import canonicalize_feed_url, remember_redirect, resolve_feed_key
+from app.services.rss import FeedFetchLimiter
+
+
+class FeedResolver:
+    """
+    Fetch each unique feed at most once per run.
+
+    Concurrent callers asking for the same (canonical) feed share one
+    in-flight fetch; later callers get the finished result.
+    """
+
+    def __init__(self, limiter: Optional[FeedFetchLimiter] = None):
+        """
+        Initialize a resolver for one run.
+
+        Args:
+            limiter: Concurrency caps shared by every fetch in this run
+        """
+        self._limiter = limiter or FeedFetchLimiter()
+        self._fetches: Dict[str, asyncio.Task] = {}
+        self._stats = {"requested": 0, "fetched": 0, "shared": 0}
+
+    def _fetch_for(self, url: str) -> asyncio.Task:
+        key = resolve_feed_key(url)
+        self._stats["requested"] += 1
+
+        task = self._fetches.get(key)
+        if task is not None:
+            self._stats["shared"] += 1
+            return task
+
+        task = asyncio.ensure_future(self._fetch(url))
+        self._fetches[key] = task
+        self._stats["fetched"] += 1
+        return task
+
+    async def _fetch(self, url: str) -> Dict[str, Any]:
+        report = await self._limiter.fetch(url)
+
+        if report.get("final_url"):
+            remember_redirect(url, report["final_url"])
+            # Later subscribers using the redirect target share this fetch too
+            self._fetches.setdefault(canonicalize_feed_url(report["final_url"]), asyncio.current_task())
+
+        return report
+
+    async def fetch_many(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch feeds, sharing results across everyone using this resolver.
+
+        Returns dict mapping each requested URL (as given) -> fetch report
+        (see rss.fetch_feed_with_report). Reports are shared between
+        subscribers and must not be mutated.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        feed_health.load(unique_urls)
+        reports = await asyncio.gather(*(self._fetch_for(url) for url in unique_urls))
+        feed_health.flush()
+        return dict(zip(unique_urls, reports))
+
+    def stats(self) -> Dict[str, int]:
+        """Return requested / fetched / shared counts for this run."""
+        return dict(self._stats)
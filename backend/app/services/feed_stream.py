@@ -0,0 +1,187 @@
+"""
+Streaming fast-path parser for RSS / Atom feeds.
+
+We only ever use the newest few entries of a feed, but feedparser needs
+the whole document. StreamingFeedParser is fed the response body chunk by
+chunk and reports when it has seen enough entries, so the download can
+stop early instead of pulling multi-megabyte feeds in full.
+
+Anything it can't handle (malformed XML, unknown formats) raises
+FeedStreamError, and callers fall back to feedparser.
+"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+from xml.etree import ElementTree
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+RDF_NS = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}"
+
+# Namespaces RSS item elements can be in: none (RSS 0.9x / 2.0), RSS 1.0 and RSS 0.90
+RSS_NAMESPACES = ("", "{http://purl.org/rss/1.0/}", "{http://my.netscape.com/rdf/simple/0.9/}")
+
+# Element names (namespace stripped) that hold a single entry
+ENTRY_TAGS = {"item", "entry"}
+
+
+class FeedStreamError(Exception):
+    """The streaming parser can't handle this document; use feedparser."""
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1] if "}" in tag else tag
+
+
+def _text(element: Optional[ElementTree.Element]) -> str:
+    if element is None:
+        return ""
+    # Atom type="xhtml" content is nested markup rather than text
+    if len(element):
+        return "".join(element.itertext()).strip()
+    return (element.text or "").strip()
+
+
+def _parse_date(value: str) -> Optional[str]:
+    """Parse RFC 822 or ISO 8601 dates to a naive UTC ISO string."""
+    if not value:
+        return None
+
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return parsed.isoformat()
+
+
+def _first_present(*elements: Optional[ElementTree.Element]) -> Optional[ElementTree.Element]:
+    # Elements without children are falsy, so `a or b` doesn't work here
+    for element in elements:
+        if element is not None:
+            return element
+    return None
+
+
+def _atom_link(element: ElementTree.Element) -> str:
+    for link in element.findall(f"{ATOM_NS}link"):
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href")
+    return ""
+
+
+def _entry_to_dict(element: ElementTree.Element) -> Dict[str, Any]:
+    """Convert an <item> / <entry> element to our entry dict shape."""
+    children = {}
+    for child in element:
+        # Keep the first occurrence of each tag
+        children.setdefault(child.tag, child)
+
+    def first(*tags: str) -> Optional[ElementTree.Element]:
+        return _first_present(*(children.get(tag) for tag in tags))
+
+    if element.tag.startswith(ATOM_NS):
+        author = first(f"{ATOM_NS}author")
+        return {
+            "title": _text(first(f"{ATOM_NS}title")),
+            "link": _atom_link(element),
+            "summary": _text(first(f"{ATOM_NS}summary")),
+            "content": _text(first(f"{ATOM_NS}content")),
+            "published": _parse_date(_text(first(f"{ATOM_NS}published", f"{ATOM_NS}updated"))),
+            "author": _text(author.find(f"{ATOM_NS}name")) if author is not None else "",
+            "guid": _text(first(f"{ATOM_NS}id")),
+        }
+
+    # RSS 0.9x / 1.0 / 2.0. Only match RSS's own elements: extension elements
+    # with the same local name (e.g. <atom:link rel="self"/>) aren't the item's.
+    def rss(name: str) -> Optional[ElementTree.Element]:
+        return first(*(namespace + name for namespace in RSS_NAMESPACES))
+
+    return {
+        "title": _text(rss("title")),
+        "link": _text(rss("link")),
+        "summary": _text(rss("description")),
+        "content": _text(children.get(f"{CONTENT_NS}encoded")),
+        "published": _parse_date(_text(_first_present(rss("pubDate"), children.get(f"{DC_NS}date")))),
+        "author": _text(_first_present(rss("author"), children.get(f"{DC_NS}creator"))),
+        # RSS 1.0 items are identified by rdf:about, as in feedparser
+        "guid": _text(rss("guid")) or element.get(f"{RDF_NS}about", ""),
+    }
+
+
+class StreamingFeedParser:
+    """
+    Incremental RSS / Atom parser that stops after the first N entries.
+
+    Usage:
+        parser = StreamingFeedParser(max_entries=1)
+        for chunk in body:
+            if parser.feed(chunk):
+                break
+        entries = parser.close()
+    """
+
+    def __init__(self, max_entries: int = 1):
+        self.max_entries = max_entries
+        self.entries: List[Dict[str, Any]] = []
+        self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._root_checked = False
+
+    @property
+    def done(self) -> bool:
+        return len(self.entries) >= self.max_entries
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Parse the next chunk of the document.
+
+        Returns True once max_entries entries have been collected.
+        Raises FeedStreamError on malformed or unsupported documents.
+        """
+        try:
+            self._parser.feed(chunk)
+            events = self._parser.read_events()
+            for event, element in events:
+                if event == "start":
+                    if not self._root_checked:
+                        self._root_checked = True
+                        if _local_name(element.tag) not in ("rss", "RDF", "feed"):
+                            raise FeedStreamError(f"Unsupported feed root <{_local_name(element.tag)}>")
+                    continue
+
+                if _local_name(element.tag) in ENTRY_TAGS:
+                    self.entries.append(_entry_to_dict(element))
+                    # Free the parsed subtree; we only keep the dict
+                    element.clear()
+                    if self.done:
+                        return True
+        except ElementTree.ParseError as e:
+            raise FeedStreamError(f"Malformed feed: {str(e)}")
+
+        return False
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        Finish parsing a fully read document and return collected entries.
+
+        Raises FeedStreamError if the document is incomplete or malformed,
+        or no entries were found (unknown format).
+        """
+        if not self.done:
+            try:
+                self._parser.close()
+            except ElementTree.ParseError as e:
+                raise FeedStreamError(f"Malformed feed: {str(e)}")
+
+        if not self.entries:
+            raise FeedStreamError("No entries found")
+
+        return self.entries
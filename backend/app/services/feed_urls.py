@@ -0,0 +1,77 @@
+"""
+Feed URL canonicalization.
+
+Different users (and the same user over time) spell the same feed in
+different ways: http vs https, trailing slashes, tracking parameters, or
+an old URL that now redirects. Everything that shares work or state per
+feed (per-run fetch dedup, the entry archive, feed health) keys feeds by
+resolve_feed_key() so those spellings collapse to one key.
+"""
+
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track clicks and never change the feed
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "igshid",
+    "ref",
+    "ref_src",
+    "_hsenc",
+    "_hsmi",
+}
+
+# Redirects seen on earlier fetches: canonical URL -> canonical final URL
+_MAX_KNOWN_REDIRECTS = 10000
+_known_redirects: "OrderedDict[str, str]" = OrderedDict()
+
+
+def canonicalize_feed_url(url: str) -> str:
+    """
+    Normalize a feed URL so equivalent spellings share one key.
+
+    Lowercases scheme and host, treats http/https as the same feed, drops
+    default ports, fragments, trailing slashes and tracking parameters,
+    and sorts the remaining query string.
+
+    The result is a cache key, not necessarily a fetchable URL.
+    """
+    parts = urlsplit(url.strip())
+
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def remember_redirect(url: str, final_url: str) -> None:
+    """Record that `url` redirects to `final_url` for future runs."""
+    source = canonicalize_feed_url(url)
+    target = canonicalize_feed_url(final_url)
+    if source == target:
+        return
+
+    _known_redirects[source] = target
+    _known_redirects.move_to_end(source)
+    while len(_known_redirects) > _MAX_KNOWN_REDIRECTS:
+        _known_redirects.popitem(last=False)
+
+
+def resolve_feed_key(url: str) -> str:
+    """Canonical key for a feed, following redirects seen before."""
+    key = canonicalize_feed_url(url)
+    return _known_redirects.get(key, key)
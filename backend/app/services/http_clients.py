@@ -0,0 +1,99 @@
+"""
+Shared outbound HTTP clients.
+
+Each external service (RSS feeds, Perplexity) gets one long-lived
+httpx.AsyncClient with its own connection pool, keep-alive and timeouts,
+instead of opening a fresh client (and TLS handshake) per request.
+
+Clients are created in the FastAPI lifespan (see app/main.py) and closed
+on shutdown. Code running outside the app (scripts, tests) still works:
+clients are created lazily on first use.
+"""
+
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import get_settings
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPClientRegistry:
+    """Registry of pooled httpx clients keyed by service name."""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def _service_config(self, service: str) -> Dict:
+        """Build client options for a service from settings."""
+        settings = get_settings()
+
+        if service == "rss":
+            return {
+                "timeout": httpx.Timeout(settings.rss_timeout_seconds, connect=5.0),
+                "limits": httpx.Limits(
+                    max_connections=settings.rss_max_connections,
+                    max_keepalive_connections=settings.rss_max_keepalive_connections,
+                    keepalive_expiry=30.0,
+                ),
+                "follow_redirects": True,
+                "headers": {"User-Agent": "DailyBrief/0.1 (+feed fetcher)"},
+            }
+
+        if service == "perplexity":
+            return {
+                "timeout": httpx.Timeout(settings.perplexity_timeout_seconds, connect=10.0),
+                "limits": httpx.Limits(
+                    max_connections=settings.perplexity_max_connections,
+                    max_keepalive_connections=settings.perplexity_max_connections,
+                    keepalive_expiry=60.0,
+                ),
+                # Verification disabled for LibreSSL compatibility
+                # This is acceptable for development; in production, install Python with OpenSSL 1.1.1+
+                "verify": False,
+                "base_url": "https://api.perplexity.ai",
+                "headers": {"Content-Type": "application/json"},
+            }
+
+        raise ValueError(f"Unknown HTTP client service: {service}")
+
+    def _create(self, service: str) -> httpx.AsyncClient:
+        config = self._service_config(service)
+        return httpx.AsyncClient(http2=_http2_available(), **config)
+
+    def start(self) -> None:
+        """Eagerly create clients for all known services."""
+        for service in ("rss", "perplexity"):
+            self.get(service)
+        print(f"[HTTP] Started shared clients: {', '.join(self._clients)} (http2={_http2_available()})")
+
+    def get(self, service: str) -> httpx.AsyncClient:
+        """Get the shared client for a service, creating it if needed."""
+        client: Optional[httpx.AsyncClient] = self._clients.get(service)
+        if client is None or client.is_closed:
+            client = self._create(service)
+            self._clients[service] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close all clients and release pooled connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                print(f"[HTTP] Error closing client: {str(e)}")
+        print("[HTTP] Closed shared clients")
+
+
+# Global instance
+http_clients = HTTPClientRegistry()
@@ -9,61 +9,208 @@ This service handles:
 Reference: https://github.com/teng-lin/notebooklm-py
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from contextlib import AsyncExitStack
 import asyncio
 
+from app.config import get_settings
+from app.services.retry import retry_async
+from app.services.text_normalize import collapse_whitespace, merge_summary_and_content
+
+# notebooklm-py / transport errors raised before the request reached the
+# server, so retrying can't add a source twice. Matched by class name
+# (including base classes) so older library versions without them still work.
+RETRYABLE_ERRORS = {
+    "RateLimitError",
+    "ConnectError",
+    "ConnectTimeout",
+}
+
+# Errors after which the source may or may not have been added (the
+# request was sent but the response was lost or failed). Adding a source
+# isn't idempotent, so these are only retried after checking the notebook.
+UNCERTAIN_ERRORS = {
+    "ServerError",
+    "NetworkError",
+    "RPCTimeoutError",
+    "SourceAddError",
+    "TimeoutError",
+    "TransportError",
+}
+
+
+def _error_names(error: BaseException) -> set:
+    return {cls.__name__ for cls in type(error).__mro__}
+
+
+def _is_retryable(error: BaseException) -> bool:
+    return bool(_error_names(error) & (RETRYABLE_ERRORS | UNCERTAIN_ERRORS))
+
+
+def _may_have_been_added(error: BaseException) -> bool:
+    names = _error_names(error)
+    return not (names & RETRYABLE_ERRORS) and bool(names & UNCERTAIN_ERRORS)
+
+
+async def _add_source(client, notebook_id: str, item: Dict[str, Any]) -> Optional[str]:
+    """Add one content item as a source. Returns its source ID (None for unknown types)."""
+    if item["type"] == "text":
+        source = await client.sources.add_text(
+            notebook_id=notebook_id,
+            title=item.get("title", "Source"),
+            content=item["content"],
+        )
+        return source.id
+    if item["type"] == "url":
+        source = await client.sources.add_url(
+            notebook_id=notebook_id,
+            url=item["url"],
+        )
+        return source.id
+    return None
+
+
+async def _find_source(client, notebook_id: str, item: Dict[str, Any]) -> Optional[str]:
+    """ID of a source already in the notebook for this item (matched by URL or title), if any."""
+    for source in await client.sources.list(notebook_id):
+        if item["type"] == "url":
+            if getattr(source, "url", None) == item["url"]:
+                return source.id
+        elif getattr(source, "title", None) == item.get("title", "Source"):
+            return source.id
+    return None
+
+
+async def add_sources(
+    client,
+    notebook_id: str,
+    content_items: List[Dict[str, Any]],
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Add content items as sources concurrently.
+
+    Up to settings.notebooklm_upload_concurrency uploads run at once, and
+    each one is retried on transient errors (rate limits, server and network
+    errors). Adding a source isn't idempotent, so after an error that may
+    have happened once the server accepted the source (timeouts, server
+    errors), the notebook's sources are checked before adding it again. An
+    item that still fails is skipped instead of failing the whole notebook.
+
+    Returns (source IDs in content_items order, failures as
+    [{"index", "title", "error"}]).
+    """
+    settings = get_settings()
+    semaphore = asyncio.Semaphore(settings.notebooklm_upload_concurrency)
+
+    async def upload(index: int, item: Dict[str, Any]):
+        title = item.get("title") or item.get("url") or "Source"
+        uncertain = False
+
+        async def attempt() -> Optional[str]:
+            nonlocal uncertain
+            if uncertain:
+                existing = await _find_source(client, notebook_id, item)
+                if existing is not None:
+                    print(f"[NotebookLM] Source '{title}' was added by an earlier attempt")
+                    return existing
+            try:
+                return await _add_source(client, notebook_id, item)
+            except Exception as e:
+                uncertain = _may_have_been_added(e)
+                raise
+
+        async with semaphore:
+            try:
+                source_id = await retry_async(
+                    attempt,
+                    is_retryable=_is_retryable,
+                    max_attempts=settings.notebooklm_upload_max_attempts,
+                    base_delay=settings.notebooklm_upload_retry_base_delay_seconds,
+                    max_delay=settings.notebooklm_upload_retry_max_delay_seconds,
+                    label=f"add source '{title}'",
+                )
+                return source_id, None
+            except Exception as e:
+                print(f"[NotebookLM] Failed to add source '{title}': {str(e)}")
+                return None, {"index": index, "title": title, "error": str(e)}
+
+    results = await asyncio.gather(*(upload(index, item) for index, item in enumerate(content_items)))
+
+    source_ids = [source_id for source_id, _ in results if source_id is not None]
+    failures = [failure for _, failure in results if failure is not None]
+    return source_ids, failures
+
+
+async def open_session(stack: AsyncExitStack, user_id: str):
+    """
+    Lease the user's pooled, open client for the lifetime of `stack`.
+
+    The lease is returned to the pool when the stack closes. Returns None
+    if the user isn't authenticated with NotebookLM.
+    """
+    from app.services.notebooklm_auth import notebooklm_client_pool
+
+    client = await notebooklm_client_pool.acquire(user_id)
+    if client is None:
+        return None
+
+    stack.push_async_callback(notebooklm_client_pool.release, user_id, client)
+    return client
+
 
 async def create_notebook_with_content(
     title: str,
     content_items: List[Dict[str, Any]],
     user_id: str,
+    client=None,
 ) -> Dict[str, Any]:
     """
     Create a NotebookLM notebook and add content sources.
 
+    Sources are uploaded concurrently (see add_sources); items that fail
+    after retries are reported in sources_failed rather than failing the
+    notebook. If none could be added, the notebook is deleted again.
+
     Args:
         title: Notebook title (e.g., "DailyBrief - 2024-01-15")
         content_items: List of content to add as sources
         user_id: User ID to get authenticated client
+        client: An already open client to use (left open). If None, one is
+            opened for this call.
 
     Returns:
-        Dict with notebook_id and status
+        Dict with notebook_id, status, sources_added and sources_failed
     """
     try:
-        from app.services.notebooklm_auth import notebooklm_auth
-
-        # Get authenticated client for this user
-        client = await notebooklm_auth.get_client(user_id)
-
-        if client is None:
-            return {
-                "notebook_id": None,
-                "status": "error",
-                "error": "User not authenticated with NotebookLM",
-            }
+        async with AsyncExitStack() as stack:
+            if client is None:
+                client = await open_session(stack, user_id)
+                if client is None:
+                    return {
+                        "notebook_id": None,
+                        "status": "error",
+                        "error": "User not authenticated with NotebookLM",
+                    }
 
-        # Open client connection (required for API calls)
-        async with client:
             # Create notebook
             notebook = await client.notebooks.create(title)
             notebook_id = notebook.id
 
-            # Add each content item as a source and collect source IDs
-            source_ids = []
-            for item in content_items:
-                if item["type"] == "text":
-                    source = await client.sources.add_text(
-                        notebook_id=notebook_id,
-                        title=item.get("title", "Source"),
-                        content=item["content"],
-                    )
-                    source_ids.append(source.id)
-                elif item["type"] == "url":
-                    source = await client.sources.add_url(
-                        notebook_id=notebook_id,
-                        url=item["url"],
-                    )
-                    source_ids.append(source.id)
+            # Add content items as sources (concurrently, in order)
+            source_ids, failures = await add_sources(client, notebook_id, content_items)
+            print(f"[NotebookLM] Added {len(source_ids)} sources, {len(failures)} failed")
+
+            if content_items and not source_ids:
+                # Don't leave an empty notebook behind in the user's account
+                try:
+                    await client.notebooks.delete(notebook_id)
+                except Exception as e:
+                    print(f"[NotebookLM] Failed to delete empty notebook {notebook_id}: {str(e)}")
+                return {
+                    "notebook_id": None,
+                    "status": "error",
+                    "error": f"Failed to add any sources: {failures[0]['error'] if failures else 'unknown error'}",
+                }
 
             # Wait for all sources to be ready before generating audio
             if source_ids:
@@ -76,7 +223,8 @@ async def create_notebook_with_content(
         return {
             "notebook_id": notebook_id,
             "status": "created",
-            "sources_added": len(content_items),
+            "sources_added": len(source_ids),
+            "sources_failed": failures,
         }
 
     except ImportError:
@@ -94,93 +242,116 @@ async def create_notebook_with_content(
         }
 
 
+DEFAULT_AUDIO_INSTRUCTIONS = (
+    "Create an engaging podcast discussion covering all the main topics "
+    "from today's sources. Make it conversational and informative, "
+    "suitable for a busy professional listening during their commute."
+)
+
+
+async def start_audio_generation(
+    client,
+    notebook_id: str,
+    instructions: Optional[str] = None,
+    format: str = "deep-dive",
+) -> str:
+    """Start generating an audio overview on an open client. Returns the task ID."""
+    # Map format string to AudioFormat enum
+    from notebooklm.rpc import AudioFormat
+    format_map = {
+        "deep-dive": AudioFormat.DEEP_DIVE,
+        "brief": AudioFormat.BRIEF,
+        "critique": AudioFormat.CRITIQUE,
+        "debate": AudioFormat.DEBATE,
+    }
+    audio_format = format_map.get(format, AudioFormat.DEEP_DIVE)
+
+    generation_status = await client.artifacts.generate_audio(
+        notebook_id=notebook_id,
+        instructions=instructions or DEFAULT_AUDIO_INSTRUCTIONS,
+        audio_format=audio_format,
+    )
+    return generation_status.task_id
+
+
+async def wait_for_audio(client, notebook_id: str, task_id: str, timeout: float) -> Dict[str, Any]:
+    """
+    Wait for an audio generation task on an open client.
+
+    Returns {"status": "complete", "audio_url", "task_id"} or
+    {"status": "error", "error"}. Raises asyncio.TimeoutError if it isn't
+    done within `timeout` seconds.
+    """
+    print(f"[NotebookLM] Waiting for audio generation to complete (notebook: {notebook_id})")
+    final_status = await client.artifacts.wait_for_completion(
+        notebook_id=notebook_id,
+        task_id=task_id,
+        timeout=timeout,
+    )
+
+    if final_status.is_failed:
+        print(f"[NotebookLM] Audio generation failed: {final_status.error}")
+        return {
+            "status": "error",
+            "error": final_status.error or "Audio generation failed",
+        }
+
+    print(f"[NotebookLM] Audio generation completed successfully")
+    return {
+        "status": "complete",
+        "audio_url": final_status.url,
+        "task_id": final_status.task_id,
+    }
+
+
 async def generate_audio_overview(
     notebook_id: str,
     user_id: str,
     instructions: Optional[str] = None,
     format: str = "deep-dive",
+    client=None,
 ) -> Dict[str, Any]:
     """
     Generate audio overview (podcast) for a notebook.
 
+    Generations use audio jobs (see audio_jobs.py), which persist the task
+    and survive restarts; this waits inline.
+
     Args:
         notebook_id: The NotebookLM notebook ID
         user_id: User ID to get authenticated client
         instructions: Optional custom instructions for the podcast
         format: Podcast format (deep-dive, brief, critique, debate)
+        client: An already open client to use (left open). If None, one is
+            opened for this call.
 
     Returns:
         Dict with generation status
     """
     try:
-        from app.services.notebooklm_auth import notebooklm_auth
-
-        # Get authenticated client for this user
-        client = await notebooklm_auth.get_client(user_id)
-
-        if client is None:
-            return {
-                "status": "error",
-                "error": "User not authenticated with NotebookLM",
-            }
-
-        # Open client connection (required for API calls)
-        async with client:
-            # Map format string to AudioFormat enum
-            from notebooklm.rpc import AudioFormat
-            format_map = {
-                "deep-dive": AudioFormat.DEEP_DIVE,
-                "brief": AudioFormat.BRIEF,
-                "critique": AudioFormat.CRITIQUE,
-                "debate": AudioFormat.DEBATE,
-            }
-            audio_format = format_map.get(format, AudioFormat.DEEP_DIVE)
-
-            # Generate audio overview
-            default_instructions = (
-                "Create an engaging podcast discussion covering all the main topics "
-                "from today's sources. Make it conversational and informative, "
-                "suitable for a busy professional listening during their commute."
-            )
-
-            generation_status = await client.artifacts.generate_audio(
-                notebook_id=notebook_id,
-                instructions=instructions or default_instructions,
-                audio_format=audio_format,
-            )
-
-            # Wait for completion (with timeout)
-            # Note: Audio generation can take up to 10 minutes
-            print(f"[NotebookLM] Waiting for audio generation to complete (notebook: {notebook_id})")
-
-            try:
-                final_status = await client.artifacts.wait_for_completion(
-                    notebook_id=notebook_id,
-                    task_id=generation_status.task_id,
-                    timeout=600,  # 10 min timeout
-                )
-
-                if final_status.is_failed:
-                    print(f"[NotebookLM] Audio generation failed: {final_status.error}")
+        async with AsyncExitStack() as stack:
+            if client is None:
+                client = await open_session(stack, user_id)
+                if client is None:
                     return {
                         "status": "error",
-                        "error": final_status.error or "Audio generation failed",
+                        "error": "User not authenticated with NotebookLM",
                     }
 
-                print(f"[NotebookLM] Audio generation completed successfully")
-                return {
-                    "status": "complete",
-                    "audio_url": final_status.url,
-                    "task_id": final_status.task_id,
-                }
+            task_id = await start_audio_generation(client, notebook_id, instructions, format)
+
+            # Wait for completion (with timeout)
+            # Note: Audio generation can take up to 10 minutes
+            try:
+                return await wait_for_audio(client, notebook_id, task_id, timeout=600)  # 10 min timeout
             except asyncio.TimeoutError:
                 # If we timeout, the audio might still be generating
                 # Return success anyway since the notebook was created
-                print(f"[NotebookLM] Audio generation timed out after 20 minutes, but may still complete")
+                print(f"[NotebookLM] Audio generation timed out after 10 minutes, but may still complete")
                 return {
                     "status": "complete",
                     "audio_url": None,
-                    "task_id": generation_status.task_id,
+                    "task_id": task_id,
                     "note": "Audio generation initiated but timed out. Check NotebookLM app.",
                 }
 
@@ -210,10 +381,23 @@ def format_content_for_notebook(
     Format aggregated content for adding to NotebookLM.
 
     Combines all sources into a list of content items ready to be
-    added to a notebook.
+    added to a notebook. RSS HTML is normalized to plain text (markup,
+    scripts and boilerplate stripped, duplicated summary/content text
+    removed); each item records bytes_before / bytes_after.
     """
     content_items = []
 
+    def add_item(title: str, raw_content: str, content: str) -> None:
+        item = {
+            "type": "text",
+            "title": title,
+            "content": content,
+            "bytes_before": len(raw_content.encode("utf-8")),
+            "bytes_after": len(content.encode("utf-8")),
+        }
+        print(f"[NotebookLM] Source '{title}': {item['bytes_before']} -> {item['bytes_after']} bytes")
+        content_items.append(item)
+
     # Add Substack posts (priority sources)
     for post in substack_posts:
         content_items.append({
@@ -225,18 +409,130 @@ def format_content_for_notebook(
     # Add RSS entries
     for feed_url, entries in rss_entries.items():
         for entry in entries:
-            content_items.append({
-                "type": "text",
-                "title": entry["title"],
-                "content": f"# {entry['title']}\n\n{entry.get('summary', '')}\n\n{entry.get('content', '')}",
-            })
+            raw_content = f"# {entry['title']}\n\n{entry.get('summary', '')}\n\n{entry.get('content', '')}"
+            body = merge_summary_and_content(entry.get("summary", ""), entry.get("content", ""))
+            add_item(entry["title"], raw_content, f"# {entry['title']}\n\n{body}")
 
     # Add news summaries from Perplexity
     for topic, summary in news_summaries.items():
-        content_items.append({
+        raw_content = f"# Latest News: {topic}\n\n{summary}"
+        add_item(f"News: {topic}", raw_content, collapse_whitespace(raw_content))
+
+    return content_items
+
+
+def _item_text(item: Dict[str, Any]) -> str:
+    """Item content with a heading, for use inside a bundle."""
+    content = item.get("content") or item.get("url", "")
+    if content.lstrip().startswith("#"):
+        return content
+    return f"# {item.get('title', 'Source')}\n\n{content}"
+
+
+# Separates articles (and the contents list) inside a bundle
+BUNDLE_SEPARATOR = "\n\n---\n\n"
+
+
+def _bundle_header(number: int, total: int) -> str:
+    return f"Daily Brief sources, part {number} of {total}\n\nContents:\n"
+
+
+def _contents_line(item: Dict[str, Any]) -> str:
+    return f"- {item.get('title', 'Source')}"
+
+
+def bundle_content_items(
+    content_items: List[Dict[str, Any]],
+    max_sources: int,
+    max_source_bytes: int,
+) -> List[Dict[str, Any]]:
+    """
+    Pack content items into at most `max_sources` consolidated text sources.
+
+    Each source is one NotebookLM add_text call and one wait in
+    wait_for_sources, so bundling keeps both roughly constant however many
+    feeds and topics a user has. Items keep their order and are split into
+    consecutive runs of roughly equal size. A bundle (including its contents
+    list, header and separators) never grows past `max_source_bytes`; if the
+    items don't fit in `max_sources` bundles, more are added, and an item
+    larger than the budget becomes a source of its own.
+
+    Each bundle starts with a list of its articles, and every article keeps
+    its own "# Title" heading, separated by a rule.
+
+    URL items are never bundled (NotebookLM fetches them itself); they stay
+    in place and end the bundle before them, which can add bundles.
+    """
+    texts = [item for item in content_items if item["type"] == "text"]
+
+    if len(texts) <= max_sources:
+        return content_items
+
+    # Header bytes, assuming part numbers as wide as they can get
+    overhead = len(_bundle_header(len(texts), len(texts)).encode("utf-8"))
+    separator_bytes = len(BUNDLE_SEPARATOR.encode("utf-8"))
+
+    def packed_size(item: Dict[str, Any]) -> int:
+        """Bytes an item adds to a bundle: its text, separator and contents line."""
+        return (
+            len(_item_text(item).encode("utf-8"))
+            + separator_bytes
+            + len(_contents_line(item).encode("utf-8")) + 1
+        )
+
+    # Split the text items, in order, into runs of roughly equal size;
+    # URL items are kept where they are, between runs
+    parts: List[Any] = []  # Bundles (lists of items) and URL items, in order
+    bundle_count = 0
+    current: List[Dict[str, Any]] = []
+    current_bytes = overhead
+    remaining = sum(packed_size(item) for item in texts)  # Item bytes not yet in a finished bundle
+
+    def finish_bundle() -> None:
+        nonlocal bundle_count, current, current_bytes, remaining
+        if current:
+            parts.append(current)
+            bundle_count += 1
+            remaining -= current_bytes - overhead
+            current, current_bytes = [], overhead
+
+    for item in content_items:
+        if item["type"] != "text":
+            finish_bundle()
+            parts.append(item)
+            continue
+
+        size = packed_size(item)
+        slots = max(max_sources - bundle_count, 1)
+        target = remaining / slots
+        if current and (
+            current_bytes + size > max_source_bytes
+            or (slots > 1 and current_bytes - overhead + size / 2 > target)
+        ):
+            finish_bundle()
+        current.append(item)
+        current_bytes += size
+    finish_bundle()
+
+    result = []
+    number = 0
+    for part in parts:
+        if isinstance(part, dict):
+            result.append(part)
+            continue
+
+        number += 1
+        titles = [item.get("title", "Source") for item in part]
+        contents = "\n".join(_contents_line(item) for item in part)
+        body = BUNDLE_SEPARATOR.join(_item_text(item) for item in part)
+        content = f"{_bundle_header(number, bundle_count)}{contents}{BUNDLE_SEPARATOR}{body}"
+        result.append({
             "type": "text",
-            "title": f"News: {topic}",
-            "content": f"# Latest News: {topic}\n\n{summary}",
+            "title": f"Daily Brief ({number}/{bundle_count}): {titles[0]}" + (f" + {len(titles) - 1} more" if len(titles) > 1 else ""),
+            "content": content,
+            "items": len(part),
+            "bytes_after": len(content.encode("utf-8")),
         })
 
-    return content_items
+    print(f"[NotebookLM] Bundled {len(texts)} items into {bundle_count} sources")
+    return result
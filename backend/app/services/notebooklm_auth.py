@@ -5,14 +5,21 @@ Handles browser-based Google OAuth authentication for NotebookLM.
 Uses the notebooklm-py library which launches a browser for Google login.
 
 Credentials are stored per-user in a secure location.
+
+Open clients are kept in a per-user pool (see NotebookLMClientPool) so
+generations, manual runs and audio tasks for the same user reuse one
+client instead of rebuilding it from storage each time.
 """
 
 import json
 import asyncio
 import subprocess
 import os
+import tempfile
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 
@@ -142,6 +149,9 @@ class NotebookLMAuth:
             # Store in cache
             self._auth_cache[user_id] = auth_metadata
 
+            # Pooled clients were built from the old credentials
+            await notebooklm_client_pool.invalidate(user_id)
+
             # Clean up local storage file after saving to database
             try:
                 storage_path.unlink()
@@ -214,32 +224,20 @@ class NotebookLMAuth:
         Returns:
             NotebookLMClient instance or None if not authenticated
         """
-        if not self.is_authenticated(user_id):
-            return None
-
         try:
             from notebooklm import NotebookLMClient
             from app.services import db
 
-            # Get credentials from database
+            # Get credentials from database (one read; None if not authenticated)
             credentials = db.get_notebooklm_credentials(user_id)
             if not credentials:
                 return None
 
-            # Create temporary storage file for notebooklm-py
-            user_storage_path = self._get_user_creds_path(user_id)
-            user_storage_path.parent.mkdir(parents=True, exist_ok=True)
+            # Build the client from the stored credentials, without a file
+            return await _client_from_storage_state(NotebookLMClient, credentials)
 
-            with open(user_storage_path, "w") as f:
-                json.dump(credentials, f, indent=2)
-
-            user_storage_path.chmod(0o600)
-
-            # Load client from stored credentials
-            client = await NotebookLMClient.from_storage(path=str(user_storage_path))
-            return client
-
-        except Exception:
+        except Exception as e:
+            print(f"[NotebookLM] Failed to create client for user {user_id}: {str(e)}")
             return None
 
     async def revoke_authentication(self, user_id: str) -> Dict[str, any]:
@@ -266,6 +264,7 @@ class NotebookLMAuth:
             # Clear cache
             if user_id in self._auth_cache:
                 del self._auth_cache[user_id]
+            await notebooklm_client_pool.invalidate(user_id)
 
             return {
                 "status": "success",
@@ -278,5 +277,247 @@ class NotebookLMAuth:
             }
 
 
-# Global instance
+async def _client_from_storage_state(client_class: Any, storage_state: Dict) -> Any:
+    """
+    Build a client straight from a Playwright storage-state dict.
+
+    Cookies and tokens are loaded with notebooklm-py's auth helpers, so
+    nothing touches disk. Library versions without those helpers only take
+    a path; they get an anonymous temp file (on tmpfs when /dev/shm exists)
+    that is deleted as soon as the client has been built.
+    """
+    try:
+        from notebooklm.auth import AuthTokens, extract_cookies_from_storage, fetch_tokens
+    except ImportError:
+        temp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        # Created with mode 0600 and removed when the block exits
+        with tempfile.NamedTemporaryFile("w", suffix=".json", dir=temp_dir) as f:
+            json.dump(storage_state, f, separators=(",", ":"))
+            f.flush()
+            return await client_class.from_storage(path=f.name)
+
+    cookies = extract_cookies_from_storage(storage_state)
+    csrf_token, session_id = await fetch_tokens(cookies)
+    return client_class(AuthTokens(cookies=cookies, csrf_token=csrf_token, session_id=session_id))
+
+
+class _PooledClient:
+    """An open client with its lease count."""
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.leases = 0
+        self.last_used = time.monotonic()
+
+
+class NotebookLMClientPool:
+    """
+    Per-user pool of open NotebookLM clients.
+
+    acquire() leases the user's open client, building and opening one on a
+    miss; release() returns the lease. Clients idle longer than the TTL are
+    closed (by a background sweep started with start(), and on acquire),
+    and the least recently used idle clients are closed when more than
+    max_clients are open. Leased clients are never closed: a client
+    invalidated while leased (e.g. its credentials were replaced) is only
+    closed when its last lease is released. A client that was being built
+    while a user was invalidated is closed and rebuilt instead of being
+    pooled, since it may have been built from revoked credentials.
+    """
+
+    def __init__(self, max_clients: Optional[int] = None, idle_ttl_seconds: Optional[float] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            max_clients: Open clients to keep. Defaults to settings.notebooklm_client_pool_max_clients.
+            idle_ttl_seconds: Close clients unused for this long.
+                Defaults to settings.notebooklm_client_idle_ttl_seconds.
+        """
+        self._max_clients = max_clients
+        self._idle_ttl_seconds = idle_ttl_seconds
+        self._clients: "OrderedDict[str, _PooledClient]" = OrderedDict()  # LRU order
+        self._retired: List[_PooledClient] = []  # Removed from the pool but still leased
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Bumped by every invalidate(); a build that sees it change may hold stale credentials
+        self._epoch = 0
+        self._sweeper: Optional[asyncio.Task] = None
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "stale_builds": 0}
+
+    @property
+    def max_clients(self) -> int:
+        if self._max_clients is None:
+            from app.config import get_settings
+            self._max_clients = get_settings().notebooklm_client_pool_max_clients
+        return self._max_clients
+
+    @property
+    def idle_ttl_seconds(self) -> float:
+        if self._idle_ttl_seconds is None:
+            from app.config import get_settings
+            self._idle_ttl_seconds = get_settings().notebooklm_client_idle_ttl_seconds
+        return self._idle_ttl_seconds
+
+    def start(self) -> None:
+        """Start the background sweep closing idle clients (app startup)."""
+        if self._sweeper is None:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep())
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(min(self.idle_ttl_seconds / 2, 60.0))
+            try:
+                await self._evict_idle()
+            except Exception as e:
+                print(f"[NotebookLM] Idle client sweep failed: {str(e)}")
+
+    async def acquire(self, user_id: str) -> Optional[Any]:
+        """
+        Lease an open client for a user.
+
+        Returns None if the user isn't authenticated with NotebookLM. Every
+        client returned must be given back with release().
+        """
+        await self._evict_idle()
+
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            entry = self._clients.get(user_id)
+            if entry is not None and not _is_connected(entry.client):
+                self._clients.pop(user_id)
+                await self._retire(entry)
+                entry = None
+
+            if entry is not None:
+                self._stats["hits"] += 1
+            else:
+                self._stats["misses"] += 1
+                while True:
+                    epoch = self._epoch
+                    client = await notebooklm_auth.get_client(user_id)
+                    if client is None:
+                        return None
+                    # Open client connection (required for API calls)
+                    await client.__aenter__()
+                    if epoch == self._epoch:
+                        break
+                    # Invalidated while building: the credentials may have been revoked
+                    self._stats["stale_builds"] += 1
+                    await _close(client)
+                entry = _PooledClient(client)
+                self._clients[user_id] = entry
+
+            entry.leases += 1
+            entry.last_used = time.monotonic()
+            self._clients.move_to_end(user_id)
+
+        await self._evict_over_capacity()
+        return entry.client
+
+    async def release(self, user_id: str, client: Any) -> None:
+        """Return a client leased with acquire()."""
+        entry = self._clients.get(user_id)
+        if entry is None or entry.client is not client:
+            entry = next((retired for retired in self._retired if retired.client is client), None)
+            if entry is None:
+                return
+
+        entry.leases -= 1
+        entry.last_used = time.monotonic()
+        if entry in self._retired and entry.leases <= 0:
+            self._retired.remove(entry)
+            await _close(entry.client)
+
+    async def invalidate(self, user_id: str) -> None:
+        """Drop a user's client, e.g. after their credentials change."""
+        self._epoch += 1
+        entry = self._clients.pop(user_id, None)
+        self._drop_lock(user_id)
+        if entry is not None:
+            self._stats["invalidations"] += 1
+            await self._retire(entry)
+
+    async def close_all(self) -> None:
+        """Stop the sweep and close every pooled client (app shutdown)."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        entries = list(self._clients.values()) + self._retired
+        self._clients.clear()
+        self._retired = []
+        self._locks.clear()
+        for entry in entries:
+            await _close(entry.client)
+
+    async def _retire(self, entry: _PooledClient) -> None:
+        """Close a client removed from the pool, or defer until its leases end."""
+        if entry.leases > 0:
+            self._retired.append(entry)
+        else:
+            await _close(entry.client)
+
+    def _pop_idle(self, user_ids: List[str]) -> List[_PooledClient]:
+        """
+        Remove users' clients that are unleased right now.
+
+        Runs without awaiting, so no client can be leased between the
+        check and the removal; the caller closes the returned clients.
+        """
+        evicted = []
+        for user_id in user_ids:
+            entry = self._clients.get(user_id)
+            if entry is None or entry.leases > 0:
+                continue
+            del self._clients[user_id]
+            self._drop_lock(user_id)
+            self._stats["evictions"] += 1
+            evicted.append(entry)
+        return evicted
+
+    def _drop_lock(self, user_id: str) -> None:
+        lock = self._locks.get(user_id)
+        if lock is not None and not lock.locked():
+            del self._locks[user_id]
+
+    async def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_ttl_seconds
+        expired = [
+            user_id for user_id, entry in self._clients.items()
+            if entry.leases == 0 and entry.last_used < cutoff
+        ]
+        for entry in self._pop_idle(expired):
+            await _close(entry.client)
+
+    async def _evict_over_capacity(self) -> None:
+        idle = [user_id for user_id, entry in self._clients.items() if entry.leases == 0]
+        excess = max(len(self._clients) - self.max_clients, 0)
+        for entry in self._pop_idle(idle[:excess]):
+            await _close(entry.client)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit rate, live clients and lease counts."""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            "live_clients": len(self._clients) + len(self._retired),
+            "leased_clients": sum(1 for entry in self._clients.values() if entry.leases > 0) + len(self._retired),
+            "max_clients": self.max_clients,
+        }
+
+
+def _is_connected(client: Any) -> bool:
+    is_connected = getattr(client, "is_connected", None)
+    return is_connected() if callable(is_connected) else True
+
+
+async def _close(client: Any) -> None:
+    try:
+        await client.__aexit__(None, None, None)
+    except Exception as e:
+        print(f"[NotebookLM] Failed to close pooled client: {str(e)}")
+
+
+# Global instances
 notebooklm_auth = NotebookLMAuth()
+notebooklm_client_pool = NotebookLMClientPool()
@@ -0,0 +1,63 @@
+"""
+OPML import and export for RSS sources.
+
+OPML is the format feed readers use to move subscription lists around.
+Only the parts we need are handled: <outline> elements with an xmlUrl
+(nested folders are flattened) and a flat export of the user's feeds.
+"""
+
+from datetime import datetime
+from typing import Dict, List
+from xml.etree import ElementTree
+
+
+class OPMLError(Exception):
+    """The uploaded file isn't usable OPML."""
+
+
+def parse_opml(content: bytes) -> List[Dict[str, str]]:
+    """
+    Extract feeds from an OPML document.
+
+    Returns list of {url, name} dicts in document order, without
+    duplicate URLs.
+    """
+    try:
+        root = ElementTree.fromstring(content)
+    except ElementTree.ParseError as e:
+        raise OPMLError(f"Invalid OPML: {str(e)}")
+
+    if root.tag.lower() != "opml":
+        raise OPMLError("Invalid OPML: root element is not <opml>")
+
+    feeds = {}
+    for outline in root.iter("outline"):
+        url = (outline.get("xmlUrl") or "").strip()
+        if not url or url in feeds:
+            continue
+        name = (outline.get("title") or outline.get("text") or url).strip()
+        feeds[url] = {"url": url, "name": name}
+
+    return list(feeds.values())
+
+
+def build_opml(sources: List[Dict], title: str = "DailyBrief RSS sources") -> str:
+    """Build an OPML 2.0 document from RSS source rows."""
+    root = ElementTree.Element("opml", version="2.0")
+    head = ElementTree.SubElement(root, "head")
+    ElementTree.SubElement(head, "title").text = title
+    ElementTree.SubElement(head, "dateCreated").text = datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+    body = ElementTree.SubElement(root, "body")
+    for source in sources:
+        ElementTree.SubElement(
+            body,
+            "outline",
+            type="rss",
+            text=source["name"],
+            title=source["name"],
+            xmlUrl=source["url"],
+        )
+
+    ElementTree.indent(root)
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ElementTree.tostring(root, encoding="unicode")
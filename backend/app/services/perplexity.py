@@ -1,107 +1,709 @@
+import asyncio
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
 import httpx
-import ssl
-from typing import List
 
-from app.config import Settings
+from app.config import Settings, get_settings
+from app.services.http_clients import http_clients
+from app.services.perplexity_usage import PerplexityUsage
+from app.services.rate_limit import TokenBucket
+from app.services.retry import RetryBudget, parse_retry_after, retry_async
+from app.services.search_dedup import SearchResultIndex
+from app.services.synthesis_memo import synthesis_fingerprint, synthesis_memo
+from app.services.topic_cache import TopicResultCache, normalize_topic, topic_cache
+from app.services.topic_index import group_topics, topic_key
+
+_limiter: Optional[TokenBucket] = None
+
+# Single-flight for syntheses by fingerprint. Nothing is kept once a
+# synthesis finishes (complete ones go to synthesis_memo), only concurrent
+# runs with the same fingerprint share it.
+synthesis_flights = TopicResultCache(ttl_seconds=0, max_entries=0, empty_ttl_seconds=0)
+
+
+def get_perplexity_limiter() -> TokenBucket:
+    """Process-wide token bucket matching our Perplexity request quota."""
+    global _limiter
+    if _limiter is None:
+        settings = get_settings()
+        _limiter = TokenBucket(
+            rate=settings.perplexity_requests_per_minute / 60.0,
+            capacity=settings.perplexity_burst,
+        )
+    return _limiter
+
+
+async def _wait_for_quota(label: str) -> None:
+    waited = await get_perplexity_limiter().acquire()
+    if waited > 0.001:
+        print(f"   Rate limiter delayed {label} by {waited:.2f}s")
+
+
+# Statuses worth retrying: rate limiting and transient server-side failures
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class PerplexityAPIError(Exception):
+    """Non-200 response from the Perplexity API."""
+
+    def __init__(self, api: str, status_code: int, detail: str, retry_after: Optional[float] = None):
+        super().__init__(f"Perplexity {api} API error: {status_code} - {detail}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _is_retryable(error: BaseException) -> bool:
+    if isinstance(error, PerplexityAPIError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+def new_retry_budget(settings: Settings) -> RetryBudget:
+    """Retry budget for one run of topic research (shared across its users)."""
+    return RetryBudget(settings.perplexity_retry_budget_per_run)
 
 
-async def get_news_for_topic(topic: str, settings: Settings) -> str:
+def _call_status(error: BaseException) -> str:
+    """Status recorded for a failed call: the HTTP status or the exception name."""
+    if isinstance(error, PerplexityAPIError):
+        return str(error.status_code)
+    return type(error).__name__
+
+
+def _api_error(api: str, response: httpx.Response) -> PerplexityAPIError:
+    """Build the error for a non-200 response (body must already be read)."""
+    retry_after = parse_retry_after(response.headers.get("retry-after"))
+    if response.status_code == 429 and retry_after:
+        # Capped like retries are: a long Retry-After abandons this call
+        # (see retry_async) and must not stall every other caller with it
+        get_perplexity_limiter().pause(min(retry_after, get_settings().perplexity_retry_max_delay_seconds))
+    return PerplexityAPIError(api, response.status_code, response.text, retry_after)
+
+
+async def _post(
+    path: str,
+    api: str,
+    payload: Dict[str, Any],
+    settings: Settings,
+    budget: RetryBudget,
+    usage: PerplexityUsage,
+    topics: List[str],
+    label: str,
+) -> Dict[str, Any]:
     """
-    Query Perplexity using a two-step process:
-    1. Search API: Gather raw search results
-    2. Research API: Synthesize results into comprehensive content
+    POST to the Perplexity API with rate limiting and retries.
 
-    Returns a synthesized summary suitable for podcast generation.
+    Every attempt takes a token from the process-wide limiter and is
+    recorded in `usage`. A 429 with Retry-After also pauses the limiter, so
+    other in-flight topics back off instead of hitting the same limit.
     """
-    # Create SSL context - disable verification for LibreSSL compatibility
-    # This is acceptable for development; in production, install Python with OpenSSL 1.1.1+
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
+    client = http_clients.get("perplexity")
+    kind = "search" if path == "/search" else "completion"
 
-    async with httpx.AsyncClient(verify=False, timeout=60.0) as client:
-        # Step 1: Use Search API to get raw search results
-        print(f"   Gathering search results for: {topic}")
-        search_response = await client.post(
-            "https://api.perplexity.ai/search",
-            headers={
-                "Authorization": f"Bearer {settings.perplexity_api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "query": f"latest news about {topic}",
-                "max_results": 10,
-                "search_recency_filter": "day",  # Last 24 hours
-            },
-        )
+    async def attempt() -> Dict[str, Any]:
+        await _wait_for_quota(label)
+        started = time.monotonic()
+        try:
+            response = await client.post(
+                path,
+                headers={"Authorization": f"Bearer {settings.perplexity_api_key}"},
+                json=payload,
+            )
+            if response.status_code != 200:
+                raise _api_error(api, response)
+            data = response.json()
+        except Exception as e:
+            usage.record(kind, topics, _call_status(e), started)
+            raise
+        usage.record(kind, topics, "ok", started, data.get("usage"))
+        return data
 
-        if search_response.status_code != 200:
-            error_detail = search_response.text
-            raise Exception(f"Perplexity Search API error: {search_response.status_code} - {error_detail}")
-
-        search_data = search_response.json()
-        results = search_data.get("results", [])
-
-        if not results:
-            return f"No recent news found for {topic} in the last 24 hours."
-
-        # Format search results for synthesis
-        search_context = "\n\n".join([
-            f"**{result.get('title', '')}** ({result.get('url', '')})\n{result.get('snippet', '')}"
-            for result in results
-        ])
-
-        # Step 2: Use Agentic Research API to synthesize search results
-        print(f"   Synthesizing research for: {topic}")
-        research_response = await client.post(
-            "https://api.perplexity.ai/chat/completions",
-            headers={
-                "Authorization": f"Bearer {settings.perplexity_api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": "sonar",  # Perplexity's native model for research
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "Synthesize the provided search results into comprehensive research. Include key facts, trends, and recent developments. Provide detailed information suitable for a podcast. Reference the sources provided."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Research these topics comprehensively: {topic}\n\nHere are search results to synthesize:\n\n{search_context}"
-                    }
-                ],
-            },
+    return await retry_async(
+        attempt,
+        is_retryable=_is_retryable,
+        max_attempts=settings.perplexity_max_attempts,
+        base_delay=settings.perplexity_retry_base_delay_seconds,
+        max_delay=settings.perplexity_retry_max_delay_seconds,
+        budget=budget,
+        label=label,
+    )
+
+
+SYNTHESIS_MODEL = "sonar"  # Perplexity's native model for research
+
+# Bump whenever the prompts or the search-result formatting change, so
+# memoized syntheses made with the old prompts aren't reused
+PROMPT_VERSION = "1"
+
+SYNTHESIS_PROMPT = (
+    "Synthesize the provided search results into comprehensive research. Include key facts, trends, "
+    "and recent developments. Provide detailed information suitable for a podcast. Reference the sources provided."
+)
+
+BATCH_SYNTHESIS_PROMPT = SYNTHESIS_PROMPT + (
+    " You will be given search results for several topics. Write one section per topic, in the order given. "
+    "Start each section with its delimiter line exactly as given (for example '=== TOPIC: AI ==='), "
+    "and do not write anything outside the sections."
+)
+
+# Matches the delimiter lines that start each section of a batched synthesis
+TOPIC_SECTION_PATTERN = re.compile(r"^\s*=== TOPIC: (.+?) ===\s*$", re.MULTILINE)
+
+# Human-readable Perplexity search_recency_filter windows
+RECENCY_WINDOWS = {
+    "hour": "the last hour",
+    "day": "the last 24 hours",
+    "week": "the last week",
+    "month": "the last month",
+}
+
+
+async def get_news_for_topic(
+    topic: str,
+    settings: Settings,
+    recency: str = "day",
+    retry_budget: Optional[RetryBudget] = None,
+) -> str:
+    """
+    Get a synthesized news summary for a single topic.
+
+    Raises if the topic couldn't be researched (see get_news_for_topics).
+    """
+    summaries, errors = await get_news_for_topics([topic], settings, recency, retry_budget)
+    if errors:
+        raise Exception(next(iter(errors.values())))
+    return next(iter(summaries.values()))
+
+
+async def _search_cached(
+    topic: str,
+    settings: Settings,
+    recency: str,
+    budget: RetryBudget,
+    usage: PerplexityUsage,
+) -> List[Dict[str, Any]]:
+    """
+    Search results for a topic.
+
+    Results are shared across users through the topic cache, keyed by the
+    topic's canonical key (see topic_index.topic_key) and the recency
+    window, so "AI" and "Artificial Intelligence" share one search. The
+    first requester's spelling is the query; concurrent requests for the
+    same key wait for that search instead of issuing their own (the search
+    is accounted to the generation that made it).
+    """
+    return await topic_cache.get_or_create(
+        topic_cache.make_key(topic_key(topic), recency),
+        lambda: _search_topic(topic, settings, recency, budget, usage),
+    )
+
+
+async def _search_topic(
+    topic: str,
+    settings: Settings,
+    recency: str,
+    budget: RetryBudget,
+    usage: PerplexityUsage,
+) -> List[Dict[str, Any]]:
+    """Step 1: Use Search API to get raw search results for a topic."""
+    print(f"   Gathering search results for: {topic}")
+    search_data = await _post(
+        "/search",
+        "Search",
+        {
+            "query": f"latest news about {topic}",
+            "max_results": 10,
+            "search_recency_filter": recency,
+        },
+        settings,
+        budget,
+        usage,
+        [topic],
+        label=f"search for {topic}",
+    )
+    return search_data.get("results", [])
+
+
+def _format_search_context(results: List[Dict[str, Any]]) -> str:
+    """Format search results for synthesis."""
+    return "\n\n".join([
+        f"**{result.get('title', '')}** ({result.get('url', '')})\n{result.get('snippet', '')}"
+        for result in results
+    ])
+
+
+def _no_results_message(topic: str, recency: str) -> str:
+    return f"No recent news found for {topic} in {RECENCY_WINDOWS.get(recency, recency)}."
+
+
+def _covered_message(topic: str) -> str:
+    return f"The latest news about {topic} is already covered by your other topics and feeds."
+
+
+class _StreamStalled(httpx.TimeoutException):
+    """Stream produced nothing before its idle or total deadline (retryable)."""
+
+
+def _parse_sse_data(line: str) -> Optional[Dict[str, Any]]:
+    """Parse one `data:` line of a server-sent event stream."""
+    if not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if not data or data == "[DONE]":
+        return None
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
+
+
+async def _stream_completion(
+    payload: Dict[str, Any],
+    settings: Settings,
+    budget: RetryBudget,
+    usage: PerplexityUsage,
+    topics: List[str],
+    label: str,
+) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    Run a chat completion in streaming mode.
+
+    Chunks are consumed as they arrive. The stream may run for up to
+    settings.perplexity_stream_total_seconds, but is abandoned if no chunk
+    arrives for settings.perplexity_stream_idle_seconds. If either deadline
+    (or a connection error) hits after text has arrived, the partial text
+    is kept rather than thrown away. Failures before the first token are
+    retried like any other request.
+
+    Returns (text or None, metrics) where metrics has ttft_ms (time to first
+    token), total_ms, truncated and chunks.
+    """
+    client = http_clients.get("perplexity")
+    idle_seconds = settings.perplexity_stream_idle_seconds
+    timeout = httpx.Timeout(settings.perplexity_timeout_seconds, connect=10.0, read=idle_seconds)
+
+    async def attempt() -> Tuple[Optional[str], Dict[str, Any]]:
+        await _wait_for_quota(label)
+        started = time.monotonic()
+        deadline = started + settings.perplexity_stream_total_seconds
+        parts: List[str] = []
+        metrics: Dict[str, Any] = {"ttft_ms": None, "total_ms": None, "truncated": False, "chunks": 0}
+
+        try:
+            async with client.stream(
+                "POST",
+                "/chat/completions",
+                headers={"Authorization": f"Bearer {settings.perplexity_api_key}"},
+                json={**payload, "stream": True},
+                timeout=timeout,
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise _api_error("Research", response)
+
+                lines = response.aiter_lines()
+                while True:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        if remaining <= 0:
+                            raise asyncio.TimeoutError()
+                        line = await asyncio.wait_for(lines.__anext__(), timeout=min(idle_seconds, remaining))
+                    except StopAsyncIteration:
+                        break
+                    except (asyncio.TimeoutError, httpx.TransportError) as e:
+                        if not parts:
+                            raise _StreamStalled(f"No tokens received before timeout for {label}") from e
+                        if not isinstance(e, asyncio.TimeoutError):
+                            reason = f"stream error: {e}"
+                        elif time.monotonic() >= deadline:
+                            reason = "total budget reached"
+                        else:
+                            reason = "idle timeout"
+                        print(f"   Stopped {label} early ({reason}), keeping partial text")
+                        metrics["truncated"] = True
+                        break
+
+                    chunk = _parse_sse_data(line)
+                    if not chunk:
+                        continue
+                    if chunk.get("usage"):
+                        metrics["usage"] = chunk["usage"]
+                    for choice in chunk.get("choices") or []:
+                        delta = (choice.get("delta") or {}).get("content")
+                        if delta:
+                            if metrics["ttft_ms"] is None:
+                                metrics["ttft_ms"] = round((time.monotonic() - started) * 1000)
+                            parts.append(delta)
+                            metrics["chunks"] += 1
+        except Exception as e:
+            usage.record("completion", topics, _call_status(e), started)
+            raise
+        usage.record("completion", topics, "ok", started, metrics.get("usage"))
+
+        metrics["total_ms"] = round((time.monotonic() - started) * 1000)
+        return ("".join(parts) or None), metrics
+
+    return await retry_async(
+        attempt,
+        is_retryable=_is_retryable,
+        max_attempts=settings.perplexity_max_attempts,
+        base_delay=settings.perplexity_retry_base_delay_seconds,
+        max_delay=settings.perplexity_retry_max_delay_seconds,
+        budget=budget,
+        label=label,
+    )
+
+
+async def _complete(
+    system_prompt: str,
+    user_prompt: str,
+    settings: Settings,
+    budget: RetryBudget,
+    usage: PerplexityUsage,
+    topics: List[str],
+) -> Tuple[Optional[str], bool]:
+    """
+    Step 2: Use Agentic Research API to synthesize search results.
+
+    With settings.perplexity_stream_synthesis the completion is streamed
+    (see _stream_completion) and may be partial if it hit its deadline.
+
+    Returns (completion text or None if the response had no text, whether
+    the text was truncated).
+    """
+    label = ", ".join(topics)
+    print(f"   Synthesizing research for: {label}")
+    payload = {
+        "model": SYNTHESIS_MODEL,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+    }
+
+    if settings.perplexity_stream_synthesis:
+        research_text, metrics = await _stream_completion(
+            payload, settings, budget, usage, topics, label=f"synthesis for {label}"
         )
+        print(
+            f"   Synthesis for {label}: first token {metrics['ttft_ms']}ms, total {metrics['total_ms']}ms"
+            + (" (truncated)" if metrics["truncated"] else "")
+        )
+        return research_text, metrics["truncated"]
+
+    started = time.monotonic()
+    research_data = await _post(
+        "/chat/completions",
+        "Research",
+        payload,
+        settings,
+        budget,
+        usage,
+        topics,
+        label=f"synthesis for {label}",
+    )
+    print(f"   Synthesis for {label}: total {round((time.monotonic() - started) * 1000)}ms")
+
+    # Extract synthesized text from response
+    if "choices" in research_data and len(research_data["choices"]) > 0:
+        return research_data["choices"][0]["message"]["content"], False
+    return None, False
+
 
-        if research_response.status_code != 200:
-            error_detail = research_response.text
-            raise Exception(f"Perplexity Research API error: {research_response.status_code} - {error_detail}")
+async def _synthesize_topic(
+    topic: str,
+    results: List[Dict[str, Any]],
+    settings: Settings,
+    budget: RetryBudget,
+    usage: PerplexityUsage,
+) -> Tuple[str, bool]:
+    """
+    Synthesize one topic's search results into a research summary.
+
+    Returns (summary, complete); complete is False for fallbacks and
+    truncated syntheses, which shouldn't be memoized.
+    """
+    search_context = _format_search_context(results)
+
+    research_text, truncated = await _complete(
+        SYNTHESIS_PROMPT,
+        f"Research these topics comprehensively: {topic}\n\nHere are search results to synthesize:\n\n{search_context}",
+        settings,
+        budget,
+        usage,
+        [topic],
+    )
+
+    if research_text is None:
+        # Fallback to formatted search results if synthesis fails
+        return f"# Latest news about {topic}\n\n{search_context}", False
+    return f"# Research: {topic}\n\n{research_text}", not truncated
+
+
+def _topic_delimiter(topic: str) -> str:
+    return f"=== TOPIC: {topic} ==="
+
+
+def _split_batch_sections(text: str, topics: List[str]) -> Dict[str, str]:
+    """Split a batched completion back into topic -> section text."""
+    by_normalized = {normalize_topic(topic): topic for topic in topics}
+    sections: Dict[str, str] = {}
+
+    parts = TOPIC_SECTION_PATTERN.split(text)
+    # parts = [preamble, topic1, body1, topic2, body2, ...]
+    for heading, body in zip(parts[1::2], parts[2::2]):
+        topic = by_normalized.get(normalize_topic(heading))
+        if topic and body.strip() and topic not in sections:
+            sections[topic] = body.strip()
+
+    return sections
+
+
+async def _synthesize_topics_batch(
+    topic_results: Dict[str, List[Dict[str, Any]]],
+    settings: Settings,
+    budget: RetryBudget,
+    usage: PerplexityUsage,
+) -> Dict[str, Tuple[str, bool]]:
+    """
+    Synthesize several topics in one completion.
+
+    The model is asked for one delimited section per topic; sections are
+    parsed back into topic -> (summary, complete) as for _synthesize_topic.
+    Topics whose section is missing fall back to their formatted search
+    results.
+    """
+    topics = list(topic_results)
+    user_prompt = "Research each of these topics comprehensively, one section per topic.\n\n" + "\n\n".join(
+        f"{_topic_delimiter(topic)}\nHere are search results to synthesize:\n\n{_format_search_context(results)}"
+        for topic, results in topic_results.items()
+    )
 
-        research_data = research_response.json()
+    research_text, truncated = await _complete(
+        BATCH_SYNTHESIS_PROMPT,
+        user_prompt,
+        settings,
+        budget,
+        usage,
+        topics,
+    )
+    sections = _split_batch_sections(research_text or "", topics)
 
-        # Extract synthesized text from response
-        if "choices" in research_data and len(research_data["choices"]) > 0:
-            research_text = research_data["choices"][0]["message"]["content"]
-            return f"# Research: {topic}\n\n{research_text}"
+    summaries = {}
+    for topic, results in topic_results.items():
+        if topic in sections:
+            # Any section of a truncated completion may be the cut-off one
+            summaries[topic] = (f"# Research: {topic}\n\n{sections[topic]}", not truncated)
         else:
-            # Fallback to formatted search results if synthesis fails
-            return f"# Latest news about {topic}\n\n{search_context}"
+            print(f"   Batched synthesis returned no section for: {topic}")
+            summaries[topic] = (f"# Latest news about {topic}\n\n{_format_search_context(results)}", False)
+    return summaries
 
 
-async def get_news_for_topics(topics: List[str], settings: Settings) -> dict:
+async def _synthesize_all(
+    topic_results: Dict[str, List[Dict[str, Any]]],
+    settings: Settings,
+    budget: RetryBudget,
+    usage: PerplexityUsage,
+) -> Tuple[Dict[str, str], Dict[str, str]]:
     """
-    Get news summaries for multiple topics.
+    Synthesize every topic's search results.
+
+    Topics whose results match an earlier synthesis (same fingerprint, see
+    synthesis_memo) reuse it without calling the API, and topics whose
+    fingerprint is already being synthesized by a concurrent run wait for
+    that synthesis (single-flight, like the topic cache) instead of running
+    their own. The rest are synthesized: with settings.perplexity_batch_synthesis,
+    up to perplexity_batch_size topics share one completion; otherwise each
+    topic gets its own. Complete syntheses are memoized.
 
-    Returns a dict mapping topic -> news summary.
+    Returns (summaries, errors) keyed by topic.
     """
-    results = {}
+    semaphore = asyncio.Semaphore(settings.perplexity_topic_concurrency)
+    summaries: Dict[str, str] = {}
+    errors: Dict[str, str] = {}
+
+    # Keyed like the topic cache, so equivalent topics of other users match
+    fingerprints = {
+        topic: synthesis_fingerprint(topic_key(topic), results, SYNTHESIS_MODEL, PROMPT_VERSION)
+        for topic, results in topic_results.items()
+    }
+    memoized = synthesis_memo.get_many(list(fingerprints.values()))
+
+    # Claim the rest synchronously, so a concurrent run can't start the same synthesis
+    topics: List[str] = []
+    shared: List[str] = []
+    unsettled = set()  # Fingerprints claimed here and not yet resolved or failed
+    for topic, fingerprint in fingerprints.items():
+        if fingerprint in memoized:
+            print(f"   Reusing synthesis for unchanged results: {topic}")
+            summaries[topic] = memoized[fingerprint]
+        elif synthesis_flights.lookup(fingerprint)[2] is not None:
+            print(f"   Waiting for a concurrent synthesis of: {topic}")
+            shared.append(topic)
+        else:
+            synthesis_flights.claim(fingerprint)
+            unsettled.add(fingerprint)
+            topics.append(topic)
+
+    def finish(synthesized: Dict[str, Tuple[str, bool]]) -> None:
+        """Record syntheses, memoize complete ones and hand them to waiting runs."""
+        synthesis_memo.put_many(
+            {
+                fingerprints[topic]: (topic, summary)
+                for topic, (summary, complete) in synthesized.items()
+                if complete
+            },
+            PROMPT_VERSION,
+        )
+        for topic, (summary, _) in synthesized.items():
+            summaries[topic] = summary
+            synthesis_flights.resolve(fingerprints[topic], summary)
+            unsettled.discard(fingerprints[topic])
 
-    for topic in topics:
+    async def synthesize_alone(topic: str) -> str:
+        """Synthesize a topic whose concurrent synthesis was abandoned."""
+        async with semaphore:
+            synthesized = await _synthesize_topic(topic, topic_results[topic], settings, budget, usage)
+        if synthesized[1]:
+            synthesis_memo.put_many({fingerprints[topic]: (topic, synthesized[0])}, PROMPT_VERSION)
+        return synthesized[0]
+
+    async def wait_for_shared(topic: str):
+        try:
+            summaries[topic] = await synthesis_flights.get_or_create(
+                fingerprints[topic], lambda: synthesize_alone(topic)
+            )
+        except Exception as e:
+            print(f"   Failed to synthesize news for {topic}: {str(e)}")
+            errors[topic] = str(e)
+
+    batch_size = settings.perplexity_batch_size if settings.perplexity_batch_synthesis else 1
+    batches = [topics[i:i + batch_size] for i in range(0, len(topics), batch_size)]
+
+    async def synthesize(batch: List[str]):
         try:
-            summary = await get_news_for_topic(topic, settings)
-            results[topic] = summary
+            async with semaphore:
+                if len(batch) == 1:
+                    topic = batch[0]
+                    finish({topic: await _synthesize_topic(topic, topic_results[topic], settings, budget, usage)})
+                else:
+                    finish(await _synthesize_topics_batch(
+                        {topic: topic_results[topic] for topic in batch}, settings, budget, usage
+                    ))
         except Exception as e:
-            results[topic] = f"Error fetching news: {str(e)}"
+            print(f"   Failed to synthesize news for {', '.join(batch)}: {str(e)}")
+            for topic in batch:
+                errors[topic] = str(e)
+                synthesis_flights.fail(fingerprints[topic], e)
+                unsettled.discard(fingerprints[topic])
+
+    try:
+        await asyncio.gather(
+            *(synthesize(batch) for batch in batches),
+            *(wait_for_shared(topic) for topic in shared),
+        )
+    finally:
+        # Cancelled (possibly before a batch even started): let waiting runs take over
+        for fingerprint in unsettled:
+            synthesis_flights.abandon(fingerprint)
+    return summaries, errors
+
+
+async def get_news_for_topics(
+    topics: List[str],
+    settings: Settings,
+    recency: str = "day",
+    retry_budget: Optional[RetryBudget] = None,
+    exclude_urls: Optional[List[str]] = None,
+    usage: Optional[PerplexityUsage] = None,
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Get news summaries for multiple topics.
+
+    1. Equivalent topics ("AI", "AI news", see topic_index) are merged and
+       researched once; the summary (or error) is returned under all of the
+       merged topics joined with " / ".
+    2. Each topic is searched (through the cross-user topic cache, which
+       also shares searches between users' equivalent topics).
+    3. Topics whose stories are nearly all already covered, by an earlier
+       topic or by `exclude_urls` (articles coming from the user's feeds),
+       are skipped (see settings.perplexity_min_results_per_topic).
+    4. Each remaining topic's search results are synthesized (see
+       _synthesize_all). Syntheses depend only on the shared search
+       results, not on the user, so they are reused across users.
+
+    Topics are processed concurrently (up to settings.perplexity_topic_concurrency
+    at a time); every API call still goes through the process-wide rate limiter.
+    Transient errors are retried within `retry_budget` (scheduled runs share
+    one across users; a fresh one is used otherwise). Every API call is
+    recorded in `usage` when given.
+
+    Returns (summaries, errors): topic -> news summary for topics that
+    succeeded and topic -> error message for topics that failed, each in
+    the order given. Failed topics are never returned as summaries.
+    """
+    budget = retry_budget or new_retry_budget(settings)
+    usage = usage if usage is not None else PerplexityUsage()
+
+    # Research each group under the user's own spelling of its first topic
+    groups = {members[0]: members for members in group_topics(topics).values()}
+    for label, members in groups.items():
+        if len(members) > 1:
+            print(f"   Merged similar topics {members} as: {label}")
+    labels = list(groups)
+
+    semaphore = asyncio.Semaphore(settings.perplexity_topic_concurrency)
+
+    async def search(topic: str):
+        async with semaphore:
+            try:
+                return topic, await _search_cached(topic, settings, recency, budget, usage), None
+            except Exception as e:
+                print(f"   Failed to search news for {topic}: {str(e)}")
+                return topic, None, str(e)
+
+    searched = await asyncio.gather(*(search(label) for label in labels))
+    errors = {label: error for label, _, error in searched if error is not None}
+    found = {label: results for label, results, error in searched if error is None and results}
+
+    # Which of each topic's stories are new to this user (not in their feeds
+    # or already under an earlier topic). Syntheses are made from the shared
+    # results so they can be reused across users; this only decides which
+    # topics are worth including.
+    result_index = SearchResultIndex(min_results_per_topic=0)
+    if exclude_urls:
+        result_index.exclude_urls(exclude_urls)
+    fresh = result_index.assign(found)
+    dedup_stats = result_index.stats()
+    if dedup_stats["results"]:
+        print(
+            f"   Search results: {dedup_stats['results']} total, {dedup_stats['kept']} new, "
+            f"{dedup_stats['duplicates']} duplicates, {dedup_stats['excluded']} already in feeds"
+        )
+
+    summaries = {
+        label: _no_results_message(label, recency)
+        for label, _, error in searched
+        if error is None and label not in found
+    }
+    to_synthesize = {}
+    for label, results in found.items():
+        if len(fresh[label]) < min(settings.perplexity_min_results_per_topic, len(results)):
+            print(f"   Skipping {label}: its stories are already covered by other topics or feeds")
+            summaries[label] = _covered_message(label)
+        else:
+            to_synthesize[label] = results
+
+    synthesized, synthesis_errors = await _synthesize_all(to_synthesize, settings, budget, usage)
+    summaries.update(synthesized)
+    errors.update(synthesis_errors)
 
-    return results
+    # Report each merged group under every topic the user gave for it
+    return (
+        {" / ".join(groups[label]): summaries[label] for label in labels if label in summaries},
+        {" / ".join(groups[label]): errors[label] for label in labels if label in errors},
+    )
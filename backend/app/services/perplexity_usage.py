@@ -0,0 +1,104 @@
+"""
+Per-generation accounting of Perplexity API usage.
+
+Every search and completion attempt is recorded with its latency, status,
+token counts and estimated cost. A generation's totals (overall and per
+topic) are stored in generation_logs.perplexity_usage and aggregated per
+user and day by the admin API.
+
+Costs use the `usage.cost` block when the API returns one, and otherwise
+are estimated from the per-request and per-token prices in settings.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import get_settings
+
+
+def estimate_cost(kind: str, usage: Optional[Dict[str, Any]]) -> float:
+    """Estimated USD cost of one call ("search" or "completion")."""
+    settings = get_settings()
+
+    if kind == "search":
+        return settings.perplexity_search_cost_per_request
+
+    reported = (usage or {}).get("cost")
+    if isinstance(reported, dict) and isinstance(reported.get("total_cost"), (int, float)):
+        return float(reported["total_cost"])
+
+    prompt_tokens = (usage or {}).get("prompt_tokens") or 0
+    completion_tokens = (usage or {}).get("completion_tokens") or 0
+    return (
+        settings.perplexity_completion_cost_per_request
+        + prompt_tokens * settings.perplexity_input_cost_per_million_tokens / 1_000_000
+        + completion_tokens * settings.perplexity_output_cost_per_million_tokens / 1_000_000
+    )
+
+
+class PerplexityUsage:
+    """Records Perplexity calls made for one generation."""
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+
+    def record(
+        self,
+        kind: str,
+        topics: List[str],
+        status: str,
+        started: float,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Record one API call attempt.
+
+        Args:
+            kind: "search" or "completion"
+            topics: Topics the call was for (several for batched synthesis)
+            status: "ok", the HTTP status code, or the exception name
+            started: time.monotonic() when the call started
+            usage: The response's `usage` block, if any
+        """
+        usage = usage or {}
+        self.calls.append({
+            "kind": kind,
+            "topics": topics,
+            "status": status,
+            "latency_ms": round((time.monotonic() - started) * 1000),
+            "prompt_tokens": usage.get("prompt_tokens") or 0,
+            "completion_tokens": usage.get("completion_tokens") or 0,
+            "total_tokens": usage.get("total_tokens") or 0,
+            # Failed calls aren't billed
+            "cost_usd": estimate_cost(kind, usage) if status == "ok" else 0.0,
+        })
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals for the generation, overall and per topic."""
+        totals = {
+            "requests": len(self.calls),
+            "searches": sum(1 for call in self.calls if call["kind"] == "search"),
+            "completions": sum(1 for call in self.calls if call["kind"] == "completion"),
+            "errors": sum(1 for call in self.calls if call["status"] != "ok"),
+            "prompt_tokens": sum(call["prompt_tokens"] for call in self.calls),
+            "completion_tokens": sum(call["completion_tokens"] for call in self.calls),
+            "total_tokens": sum(call["total_tokens"] for call in self.calls),
+            "cost_usd": round(sum(call["cost_usd"] for call in self.calls), 6),
+            "latency_ms_total": sum(call["latency_ms"] for call in self.calls),
+            "latency_ms_max": max((call["latency_ms"] for call in self.calls), default=0),
+        }
+
+        # Batched calls are split evenly between their topics
+        topics: Dict[str, Dict[str, Any]] = {}
+        for call in self.calls:
+            share = 1 / len(call["topics"]) if call["topics"] else 0
+            for topic in call["topics"]:
+                entry = topics.setdefault(topic, {"requests": 0, "total_tokens": 0, "cost_usd": 0.0, "latency_ms": 0})
+                entry["requests"] += 1
+                entry["total_tokens"] += round(call["total_tokens"] * share)
+                entry["cost_usd"] += call["cost_usd"] * share
+                entry["latency_ms"] += call["latency_ms"]
+        for entry in topics.values():
+            entry["cost_usd"] = round(entry["cost_usd"], 6)
+
+        return {**totals, "topics": topics}
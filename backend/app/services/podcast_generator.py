@@ -8,24 +8,33 @@ This service coordinates:
 4. Updating generation status
 """
 
+from contextlib import AsyncExitStack
 from datetime import datetime
 from typing import Optional
 
 from app.config import Settings
 from app.services.supabase import get_supabase_client
 from app.services.perplexity import get_news_for_topics
+from app.services.perplexity_usage import PerplexityUsage
+from app.services.retry import RetryBudget
 from app.services.rss import fetch_multiple_feeds
+from app.services.feed_resolver import FeedResolver
+from app.services.feed_archive import select_new_entries, advance_cursor
 from app.services.notebooklm import (
     create_notebook_with_content,
-    generate_audio_overview,
     format_content_for_notebook,
+    bundle_content_items,
+    open_session,
 )
+from app.services.audio_jobs import audio_jobs
 
 
 async def generate_podcast_for_user(
     user_id: str,
     generation_id: str,
     settings: Settings,
+    feed_resolver: Optional[FeedResolver] = None,
+    retry_budget: Optional[RetryBudget] = None,
 ) -> None:
     """
     Generate a podcast for a specific user.
@@ -36,6 +45,14 @@ async def generate_podcast_for_user(
     3. Creates NotebookLM notebook
     4. Generates audio
     5. Updates status throughout
+
+    Scheduled runs pass a shared feed_resolver so feeds followed by many
+    users are fetched once per run instead of once per user, and a shared
+    retry_budget so Perplexity retries are capped for the whole run.
+
+    A single NotebookLM client session is opened per generation and used
+    for notebook creation and source upload; the audio job leases the same
+    pooled client.
     """
     print(f"[GENERATION {generation_id}] ===== STARTING BACKGROUND TASK =====")
     print(f"[GENERATION {generation_id}] User ID: {user_id}")
@@ -43,11 +60,16 @@ async def generate_podcast_for_user(
     # Import db service
     from app.services import db
 
+    # Perplexity calls made for this generation (stored with every status update)
+    perplexity_usage = PerplexityUsage()
+
     def update_status(status: str, error: Optional[str] = None, **kwargs):
         try:
             updates = {"status": status}
             if error:
                 updates["error_message"] = error
+            if perplexity_usage.calls:
+                updates["perplexity_usage"] = perplexity_usage.summary()
             updates.update(kwargs)
             print(f"[GENERATION {generation_id}] Updating status to: {status}")
             if error:
@@ -61,6 +83,9 @@ async def generate_podcast_for_user(
             traceback.print_exc()
             raise
 
+    # Returns the NotebookLM client lease when the generation ends
+    notebooklm_session = AsyncExitStack()
+
     # Wrap everything in try-catch to catch any early failures
     try:
         # Update status to fetching
@@ -81,10 +106,41 @@ async def generate_podcast_for_user(
 
         # Fetch content from each source type
         rss_urls = [s["url"] for s in rss_sources]
-        rss_entries = await fetch_multiple_feeds(rss_urls) if rss_urls else {}
+        if not rss_urls:
+            rss_entries = {}
+        elif feed_resolver is not None:
+            feed_reports = await feed_resolver.fetch_many(rss_urls)
+            rss_entries = {url: report["entries"] for url, report in feed_reports.items()}
+        else:
+            rss_entries = await fetch_multiple_feeds(rss_urls)
+
+        # Only use entries that are new since the user's last successful generation
+        rss_entries, rss_cursor = select_new_entries(
+            user_id,
+            rss_entries,
+            max_new_per_feed=settings.rss_max_new_entries_per_feed,
+            subscribed_at={s["url"]: db.parse_timestamp(s["created_at"]) for s in rss_sources if s.get("created_at")},
+        )
 
         topic_names = [t["topic"] for t in news_topics]
-        news_summaries = await get_news_for_topics(topic_names, settings) if topic_names else {}
+        if topic_names:
+            news_summaries, topic_errors = await get_news_for_topics(
+                topic_names,
+                settings,
+                retry_budget=retry_budget,
+                # Don't synthesize stories the user already gets from their feeds
+                exclude_urls=[entry.get("link") for entries in rss_entries.values() for entry in entries],
+                usage=perplexity_usage,
+            )
+            usage_summary = perplexity_usage.summary()
+            print(
+                f"[GENERATION {generation_id}] Perplexity: {usage_summary['requests']} requests, "
+                f"{usage_summary['total_tokens']} tokens, ${usage_summary['cost_usd']:.4f}"
+            )
+        else:
+            news_summaries, topic_errors = {}, {}
+        for topic, error in topic_errors.items():
+            print(f"[GENERATION {generation_id}] Topic '{topic}' failed: {error}")
 
         # Format content for NotebookLM
         print(f"[GENERATION {generation_id}] Fetched content - RSS: {len(rss_entries)}, Topics: {len(news_summaries)}")
@@ -97,11 +153,23 @@ async def generate_podcast_for_user(
         print(f"[GENERATION {generation_id}] Formatted {len(content_items)} content items")
 
         if not content_items:
-            update_status("failed", error="No content found from any sources")
+            if topic_errors:
+                update_status("failed", error="No content found from any sources. Topic errors: " + "; ".join(
+                    f"{topic}: {error}" for topic, error in topic_errors.items()
+                ))
+            else:
+                update_status("failed", error="No content found from any sources")
             return
 
         # Update status to generating
         update_status("generating")
+
+        # Authenticate once for everything NotebookLM does in this generation
+        client = await open_session(notebooklm_session, user_id)
+        if client is None:
+            update_status("failed", error="User not authenticated with NotebookLM")
+            return
+
         print(f"[GENERATION {generation_id}] Creating NotebookLM notebook...")
 
         # Create NotebookLM notebook with custom title including topics
@@ -119,10 +187,20 @@ async def generate_podcast_for_user(
         else:
             notebook_title = f"Daily Brief - {today}"
 
+        # Pack items into a few large sources to cut NotebookLM calls
+        notebook_items = content_items
+        if settings.notebooklm_bundle_sources:
+            notebook_items = bundle_content_items(
+                content_items,
+                max_sources=settings.notebooklm_max_sources,
+                max_source_bytes=settings.notebooklm_max_source_bytes,
+            )
+
         notebook_result = await create_notebook_with_content(
             title=notebook_title,
-            content_items=content_items,
+            content_items=notebook_items,
             user_id=user_id,
+            client=client,
         )
 
         if notebook_result["status"] == "error":
@@ -137,6 +215,8 @@ async def generate_podcast_for_user(
             "rss_feeds": len(rss_entries),
             "news_topics": len(news_summaries),
             "total_items": len(content_items),
+            "notebook_sources": len(notebook_items),
+            "failed_sources": notebook_result.get("sources_failed", []),
             "details": {
                 "rss": [
                     {
@@ -149,7 +229,7 @@ async def generate_podcast_for_user(
                                 "content": entry.get("content", ""),  # Full content
                                 "link": entry.get("link", ""),
                             }
-                            for entry in entries  # Only latest entry per feed
+                            for entry in entries  # Entries new since the last generation
                         ]
                     }
                     for feed_url, entries in rss_entries.items()
@@ -161,6 +241,13 @@ async def generate_podcast_for_user(
                     }
                     for topic, summary in news_summaries.items()
                 ],
+                "topic_errors": [
+                    {
+                        "topic": topic,
+                        "error": error,
+                    }
+                    for topic, error in topic_errors.items()
+                ],
             }
         }
 
@@ -172,14 +259,16 @@ async def generate_podcast_for_user(
         )
         print(f"[GENERATION {generation_id}] Marked as complete. Audio generation will continue in NotebookLM.")
 
-        # Trigger audio generation in background (fire and forget)
-        # Audio will be available in NotebookLM app when it completes
-        asyncio.create_task(
-            generate_audio_overview(
-                notebook_id=notebook_id,
-                user_id=user_id,
-                format="deep-dive",
-            )
+        # Entries used in this generation won't be picked up again
+        advance_cursor(user_id, generation_id, rss_cursor)
+
+        # Generate audio in the background as a persisted job, which records
+        # audio_url/status on this log and resumes after a restart
+        audio_jobs.submit(
+            generation_id=generation_id,
+            user_id=user_id,
+            notebook_id=notebook_id,
+            format="deep-dive",
         )
 
     except Exception as e:
@@ -192,6 +281,11 @@ async def generate_podcast_for_user(
         except Exception as update_error:
             print(f"[GENERATION {generation_id}] CRITICAL: Failed to update status to 'failed': {str(update_error)}")
             traceback.print_exc()
+    finally:
+        try:
+            await notebooklm_session.aclose()
+        except Exception as e:
+            print(f"[GENERATION {generation_id}] Failed to close NotebookLM session: {str(e)}")
 
 
 async def run_scheduled_generation(settings: Settings) -> None:
@@ -0,0 +1,87 @@
+"""
+Async token-bucket rate limiter.
+
+Used to keep process-wide request rates to external APIs within quota
+(see perplexity_limiter) while still letting callers run concurrently.
+Time spent waiting for tokens is recorded so it can be monitored.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket (starts full).
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self._stats = {"acquired": 0, "waited": 0, "wait_seconds_total": 0.0, "wait_seconds_max": 0.0, "pauses": 0}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Wait until `tokens` are available and take them.
+
+        Waiters are served in arrival order. Returns seconds spent waiting.
+        """
+        started = time.monotonic()
+
+        # Holding the lock while sleeping keeps waiters FIFO
+        async with self._lock:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            self._refill()
+            if self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+        waited = time.monotonic() - started
+        self._stats["acquired"] += 1
+        if waited > 0.001:
+            self._stats["waited"] += 1
+        self._stats["wait_seconds_total"] += waited
+        self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back all acquisitions for `seconds`.
+
+        Used when the API says we're over quota (429 with Retry-After), so
+        concurrent callers wait instead of all hitting the same limit.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._stats["pauses"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return acquisition counts and wait time totals."""
+        acquired = self._stats["acquired"]
+        return {
+            "rate_per_minute": round(self.rate * 60, 2),
+            "capacity": self.capacity,
+            "acquired": acquired,
+            "waited": self._stats["waited"],
+            "wait_seconds_total": round(self._stats["wait_seconds_total"], 3),
+            "wait_seconds_avg": round(self._stats["wait_seconds_total"] / acquired, 3) if acquired else 0.0,
+            "wait_seconds_max": round(self._stats["wait_seconds_max"], 3),
+            "pauses": self._stats["pauses"],
+        }
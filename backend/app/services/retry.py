@@ -0,0 +1,102 @@
+"""
+Retry helpers for calls to external APIs.
+
+Transient failures (rate limits, 5xx, timeouts) are retried with
+exponential backoff and full jitter, honoring the server's Retry-After
+when it sends one. A RetryBudget caps the total number of retries across
+a whole run, so a struggling API can't turn one burst into thousands of
+extra requests.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class RetryBudget:
+    """Total number of retries allowed across every call sharing the budget."""
+
+    def __init__(self, max_retries: int):
+        self.max_retries = max_retries
+        self.used = 0
+        self.denied = 0
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget. Returns False when it's exhausted."""
+        if self.used >= self.max_retries:
+            self.denied += 1
+            return False
+        self.used += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {"max_retries": self.max_retries, "used": self.used, "denied": self.denied}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff for the given (1-based) retry attempt."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** (attempt - 1))))
+
+
+async def retry_async(
+    func: Callable[[], Awaitable[Any]],
+    *,
+    is_retryable: Callable[[BaseException], bool],
+    max_attempts: int,
+    base_delay: float,
+    max_delay: float,
+    budget: Optional[RetryBudget] = None,
+    label: str = "request",
+) -> Any:
+    """
+    Call `func` until it succeeds or fails with a final error.
+
+    An error is retried when `is_retryable(error)` is true, attempts remain,
+    and the budget (if any) still has retries. If the error carries a
+    `retry_after` (seconds) it is used as the delay; a Retry-After longer
+    than `max_delay` is treated as final rather than waited out.
+
+    The last error is re-raised once retrying stops.
+    """
+    attempt = 1
+    while True:
+        try:
+            return await func()
+        except Exception as e:
+            if not is_retryable(e) or attempt >= max_attempts:
+                raise
+
+            retry_after = getattr(e, "retry_after", None)
+            if retry_after is not None and retry_after > max_delay:
+                print(f"[RETRY] {label}: Retry-After {retry_after:.0f}s exceeds {max_delay:.0f}s, giving up")
+                raise
+
+            if budget is not None and not budget.try_spend():
+                print(f"[RETRY] {label}: retry budget exhausted, giving up")
+                raise
+
+            delay = retry_after if retry_after is not None else backoff_delay(attempt, base_delay, max_delay)
+            reason = str(e).splitlines()[0] if str(e) else type(e).__name__
+            print(f"[RETRY] {label}: attempt {attempt} failed ({reason}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
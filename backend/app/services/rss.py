@@ -1,27 +1,26 @@
+import asyncio
+import time
 import feedparser
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
 import httpx
+from collections import defaultdict
+from functools import partial
+from typing import List, Dict, Any, Optional, Union
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
 
+from app.config import get_settings
+from app.services.feed_cache import feed_cache
+from app.services.feed_health import feed_health
+from app.services.feed_parser_pool import feed_parse_pool
+from app.services.feed_stream import FeedStreamError, StreamingFeedParser
+from app.services.http_clients import http_clients
 
-async def fetch_rss_feed(url: str) -> List[Dict[str, Any]]:
-    """
-    Fetch and parse an RSS feed.
-
-    Returns only the latest entry (most recent) from the feed.
-    """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, timeout=15.0)
-        content = response.text
-
-    feed = feedparser.parse(content)
 
-    # Get only the first (most recent) entry if available
-    if not feed.entries:
-        return []
+class FeedTooLargeError(Exception):
+    """Feed body exceeded settings.rss_max_feed_bytes before we had what we needed."""
 
-    entry = feed.entries[0]  # Most recent entry
 
+def _entry_from_feedparser(entry: Any) -> Dict[str, Any]:
     # Parse published date
     published = None
     if hasattr(entry, "published_parsed") and entry.published_parsed:
@@ -29,29 +28,293 @@ async def fetch_rss_feed(url: str) -> List[Dict[str, Any]]:
     elif hasattr(entry, "updated_parsed") and entry.updated_parsed:
         published = datetime(*entry.updated_parsed[:6])
 
-    return [{
+    return {
         "title": entry.get("title", ""),
         "link": entry.get("link", ""),
         "summary": entry.get("summary", ""),
         "content": entry.get("content", [{}])[0].get("value", "") if entry.get("content") else "",
         "published": published.isoformat() if published else None,
         "author": entry.get("author", ""),
-    }]
+        "guid": entry.get("id", ""),
+    }
+
+
+def parse_feed_content(content: Union[str, bytes], max_entries: int = 1) -> List[Dict[str, Any]]:
+    """
+    Parse a full feed document with feedparser.
+
+    Returns the latest `max_entries` entries (most recent first).
+    """
+    feed = feedparser.parse(content)
+
+    # Get only the first (most recent) entries if available
+    return [_entry_from_feedparser(entry) for entry in feed.entries[:max_entries]]
+
+
+async def _read_feed_body(
+    response: httpx.Response,
+    max_entries: int,
+    max_bytes: int,
+    streaming: bool,
+) -> Dict[str, Any]:
+    """
+    Read a feed response body, parsing it incrementally when `streaming`.
+
+    Stops downloading as soon as the streaming parser has `max_entries`
+    entries. If the streaming parser gives up (malformed or unknown feed),
+    the rest of the body is read so feedparser can take over.
+
+    Returns dict with entries (None if feedparser is still needed), body
+    (the bytes read, for the feedparser fallback), bytes_read and parse_ms.
+    """
+    parser = StreamingFeedParser(max_entries=max_entries) if streaming else None
+    chunks = []
+    bytes_read = 0
+    parse_seconds = 0.0
+
+    def result(entries: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        return {
+            "entries": entries,
+            "body": b"".join(chunks) if entries is None else None,
+            "bytes_read": bytes_read,
+            "parse_ms": round(parse_seconds * 1000, 1),
+        }
+
+    async for chunk in response.aiter_bytes():
+        bytes_read += len(chunk)
+        if bytes_read > max_bytes:
+            raise FeedTooLargeError(f"Feed exceeds {max_bytes} bytes")
+        chunks.append(chunk)
+
+        if parser is None:
+            continue
+
+        started = time.perf_counter()
+        try:
+            done = parser.feed(chunk)
+        except FeedStreamError as e:
+            print(f"[RSS] {response.url} streaming parse failed, falling back to feedparser: {str(e)}")
+            parser = None
+            done = False
+        parse_seconds += time.perf_counter() - started
+
+        if done:
+            return result(parser.entries)
+
+    if parser is not None:
+        try:
+            return result(parser.close())
+        except FeedStreamError:
+            pass
+
+    return result(None)
+
+
+async def _fetch_feed(url: str) -> Dict[str, Any]:
+    """
+    Fetch and parse a feed, revalidating against the feed cache.
+
+    The body is streamed through StreamingFeedParser, which stops the
+    download once it has the newest entries and enforces
+    settings.rss_max_feed_bytes. Feeds it can't handle are parsed with
+    feedparser in the feed parse pool, off the event loop.
+
+    Returns dict with entries and fetch metadata (final_url, not_modified,
+    parser, bytes_read, queue_wait_ms, parse_ms).
+    """
+    settings = get_settings()
+    cached = feed_cache.lookup(url)
+
+    client = http_clients.get("rss")
+    async with client.stream("GET", url, headers=feed_cache.conditional_headers(cached)) as response:
+        final_url = str(response.url)
+
+        # Unchanged since last fetch - reuse the cached parse
+        if response.status_code == 304 and cached is not None:
+            feed_cache.record_not_modified()
+            return {"entries": cached["entries"], "not_modified": True, "final_url": final_url}
+
+        response.raise_for_status()
+        body = await _read_feed_body(
+            response,
+            max_entries=settings.rss_max_entries_per_feed,
+            max_bytes=settings.rss_max_feed_bytes,
+            streaming=settings.rss_streaming_parser,
+        )
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
 
+    if body["entries"] is not None:
+        entries = body["entries"]
+        parser = "stream"
+        timings = {"queue_wait_ms": 0.0, "parse_ms": body["parse_ms"]}
+    else:
+        entries, timings = await feed_parse_pool.run(
+            partial(parse_feed_content, max_entries=settings.rss_max_entries_per_feed),
+            body["body"],
+        )
+        parser = "feedparser"
 
-async def fetch_multiple_feeds(urls: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    feed_cache.store(url, etag=etag, last_modified=last_modified, entries=entries)
+
+    return {
+        "entries": entries,
+        "not_modified": False,
+        "final_url": final_url,
+        "parser": parser,
+        "bytes_read": body["bytes_read"],
+        **timings,
+    }
+
+
+async def fetch_rss_feed(url: str) -> List[Dict[str, Any]]:
+    """
+    Fetch and parse an RSS feed.
+
+    Sends If-None-Match / If-Modified-Since when the feed was seen
+    before, and reuses the cached parse on a 304.
+
+    Returns the latest settings.rss_max_entries_per_feed entries, most
+    recent first.
+    """
+    result = await _fetch_feed(url)
+    return result["entries"]
+
+
+async def fetch_feed_with_report(url: str) -> Dict[str, Any]:
+    """
+    Fetch a single feed and report how it went.
+
+    Feeds whose circuit is open (see feed_health) are skipped without a
+    request; every attempt is recorded in feed health.
+
+    Never raises. Returns dict with url, final_url (after redirects),
+    entries, latency_ms, not_modified (served from the feed cache),
+    parser ("stream" or "feedparser"), bytes_read, queue_wait_ms /
+    parse_ms (None when nothing was parsed), skipped (circuit open) and
+    error (None on success).
+    """
+    started = time.monotonic()
+    report = {
+        "url": url,
+        "final_url": None,
+        "entries": [],
+        "latency_ms": None,
+        "not_modified": False,
+        "parser": None,
+        "bytes_read": None,
+        "queue_wait_ms": None,
+        "parse_ms": None,
+        "skipped": False,
+        "error": None,
+    }
+
+    allowed, reason = feed_health.allow(url)
+    if not allowed:
+        report.update({"skipped": True, "error": reason, "latency_ms": 0.0})
+        print(f"[RSS] {url} skipped: {reason}")
+        return report
+
+    try:
+        report.update(await _fetch_feed(url))
+    except Exception as e:
+        # httpx errors carry a multi-line help suffix; keep the first line
+        report["error"] = (str(e) or e.__class__.__name__).splitlines()[0]
+
+    report["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+
+    if report["error"]:
+        feed_health.record_failure(url, report["latency_ms"], report["error"])
+        print(f"[RSS] {url} failed after {report['latency_ms']}ms: {report['error']}")
+    else:
+        feed_health.record_success(url, report["latency_ms"])
+        if report["not_modified"]:
+            detail = "not modified"
+        else:
+            detail = (
+                f"{report['parser']}, {report['bytes_read']} bytes, "
+                f"queue {report['queue_wait_ms']}ms, parse {report['parse_ms']}ms"
+            )
+        print(f"[RSS] {url} fetched {len(report['entries'])} entries in {report['latency_ms']}ms ({detail})")
+
+    return report
+
+
+class FeedFetchLimiter:
+    """
+    Concurrency caps for feed fetching.
+
+    At most `concurrency` fetches run at once overall, and at most
+    `per_host_concurrency` against any single host, so one slow or
+    popular origin can't monopolise the run.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        per_host_concurrency: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self._global = asyncio.Semaphore(concurrency or settings.rss_fetch_concurrency)
+        host_limit = per_host_concurrency or settings.rss_per_host_concurrency
+        self._hosts: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(host_limit))
+
+    async def fetch(self, url: str) -> Dict[str, Any]:
+        """Fetch a feed (see fetch_feed_with_report) once slots are free."""
+        host = (urlsplit(url).hostname or "").lower()
+        # Take the per-host slot first so waiting on a busy host
+        # doesn't hold a global slot other hosts could use
+        async with self._hosts[host]:
+            async with self._global:
+                return await fetch_feed_with_report(url)
+
+
+async def fetch_feeds_with_report(
+    urls: List[str],
+    concurrency: Optional[int] = None,
+    per_host_concurrency: Optional[int] = None,
+    limiter: Optional[FeedFetchLimiter] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch multiple feeds concurrently under a FeedFetchLimiter.
+
+    Pass `limiter` to share caps with other concurrent callers; otherwise
+    a new one is built from `concurrency` / `per_host_concurrency`.
+
+    Returns dict mapping URL -> fetch report (see fetch_feed_with_report).
+    """
+    limiter = limiter or FeedFetchLimiter(concurrency, per_host_concurrency)
+
+    unique_urls = list(dict.fromkeys(urls))
+    feed_health.load(unique_urls)
+    reports = await asyncio.gather(*(limiter.fetch(url) for url in unique_urls))
+    feed_health.flush()
+
+    return {report["url"]: report for report in reports}
+
+
+async def fetch_multiple_feeds(
+    urls: List[str],
+    concurrent: bool = True,
+) -> Dict[str, List[Dict[str, Any]]]:
     """
     Fetch multiple RSS feeds.
 
+    Feeds are fetched concurrently by default (see fetch_feeds_with_report);
+    pass concurrent=False to fetch them one after another.
+
     Returns dict mapping URL -> list of entries.
     """
+    if concurrent:
+        reports = await fetch_feeds_with_report(urls)
+        return {url: reports[url]["entries"] for url in urls}
+
     results = {}
+    feed_health.load(urls)
 
     for url in urls:
-        try:
-            entries = await fetch_rss_feed(url)
-            results[url] = entries
-        except Exception as e:
-            results[url] = []
+        report = await fetch_feed_with_report(url)
+        results[url] = report["entries"]
 
+    feed_health.flush()
     return results
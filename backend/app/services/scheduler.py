@@ -6,6 +6,8 @@ import pytz
 
 from app.services import db
 from app.services.podcast_generator import generate_podcast_for_user
+from app.services.feed_resolver import FeedResolver
+from app.services.perplexity import new_retry_budget
 from app.config import get_settings
 
 
@@ -81,6 +83,11 @@ async def check_and_generate_for_all_users():
     if users_to_generate:
         print(f"[SCHEDULER] Generating podcasts for {len(users_to_generate)} users")
 
+        # Share feed fetches across users for this run
+        feed_resolver = FeedResolver()
+        # Cap Perplexity retries for the whole run, not per user
+        retry_budget = new_retry_budget(settings)
+
         # Run generations in parallel
         tasks = []
         for user_id in users_to_generate:
@@ -91,7 +98,9 @@ async def check_and_generate_for_all_users():
             task = generate_podcast_for_user(
                 user_id=user_id,
                 generation_id=log["id"],
-                settings=settings
+                settings=settings,
+                feed_resolver=feed_resolver,
+                retry_budget=retry_budget,
             )
             tasks.append(task)
 
@@ -105,6 +114,11 @@ async def check_and_generate_for_all_users():
                 print(f"[SCHEDULER] Generation failed for user {user_id}: {result}")
             else:
                 print(f"[SCHEDULER] Generation completed for user {user_id}")
+
+        feed_stats = feed_resolver.stats()
+        print(f"[SCHEDULER] Feeds requested: {feed_stats['requested']}, fetched: {feed_stats['fetched']}, shared: {feed_stats['shared']}")
+        budget_stats = retry_budget.stats()
+        print(f"[SCHEDULER] Perplexity retries used: {budget_stats['used']}/{budget_stats['max_retries']}, denied: {budget_stats['denied']}")
     else:
         print("[SCHEDULER] No users due for generation at this time")
 
@@ -0,0 +1,100 @@
+"""
+Per-generation deduplication of Perplexity search results.
+
+Overlapping topics ("AI", "OpenAI", "tech stocks") return many of the same
+stories. Every search result is keyed by its canonical URL and a hash of
+its snippet text and assigned to exactly one topic (the one it ranks
+highest for); stories the user already gets from their RSS feeds can be
+excluded up front. The result tells which of each topic's stories are new
+to the user, which decides whether the topic is worth synthesizing.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, Iterable, List, Set
+
+from app.services.feed_urls import canonicalize_feed_url
+
+
+def result_keys(result: Dict[str, Any]) -> List[str]:
+    """Identity keys for a search result: canonical URL and snippet hash."""
+    keys = []
+    url = (result.get("url") or "").strip()
+    if url:
+        keys.append("url:" + canonicalize_feed_url(url))
+    words = re.findall(r"\w+", (result.get("snippet") or "").lower())
+    if len(words) >= 8:  # Short snippets are too generic to compare
+        keys.append("snippet:" + hashlib.sha1(" ".join(words).encode("utf-8")).hexdigest())
+    return keys
+
+
+class SearchResultIndex:
+    """Assigns each distinct search result to a single topic."""
+
+    def __init__(self, min_results_per_topic: int = 1):
+        """
+        Initialize the index.
+
+        Args:
+            min_results_per_topic: A topic left with fewer results than this
+                after deduplication gets its best-ranked duplicates back, so
+                it still has something to synthesize.
+        """
+        self.min_results_per_topic = min_results_per_topic
+        self._excluded: Set[str] = set()
+        self._stats = {"results": 0, "kept": 0, "duplicates": 0, "excluded": 0, "backfilled": 0}
+
+    def exclude_urls(self, urls: Iterable[str]) -> None:
+        """Drop results pointing at these URLs (e.g. articles already in the user's feeds)."""
+        for url in urls:
+            if url:
+                self._excluded.add("url:" + canonicalize_feed_url(url))
+
+    def assign(self, topic_results: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Deduplicate results across topics.
+
+        A result appearing under several topics goes to the topic where it
+        ranks highest (earlier topic wins ties). Input lists aren't modified.
+
+        Returns topic -> kept results, in their original order.
+        """
+        # Claim keys in rank order across all topics (earlier topic wins ties)
+        ordered = sorted(
+            (rank, topic_pos, topic, result)
+            for topic_pos, (topic, results) in enumerate(topic_results.items())
+            for rank, result in enumerate(results)
+        )
+        taken: Set[str] = set(self._excluded)
+        kept_ids = set()
+        for rank, topic_pos, topic, result in ordered:
+            self._stats["results"] += 1
+            keys = result_keys(result)
+            if any(key in self._excluded for key in keys):
+                self._stats["excluded"] += 1
+                continue
+            if any(key in taken for key in keys):
+                continue
+            taken.update(keys)
+            kept_ids.add((topic_pos, rank))
+
+        assigned: Dict[str, List[Dict[str, Any]]] = {}
+        for topic_pos, (topic, results) in enumerate(topic_results.items()):
+            kept = {rank for rank in range(len(results)) if (topic_pos, rank) in kept_ids}
+            if results and len(kept) < self.min_results_per_topic:
+                # Give the topic back its best-ranked duplicates
+                for rank in range(len(results)):
+                    if len(kept) >= self.min_results_per_topic:
+                        break
+                    if rank not in kept and not any(key in self._excluded for key in result_keys(results[rank])):
+                        kept.add(rank)
+                        self._stats["backfilled"] += 1
+
+            assigned[topic] = [results[rank] for rank in sorted(kept)]
+            self._stats["kept"] += len(kept)
+
+        self._stats["duplicates"] = self._stats["results"] - self._stats["kept"] - self._stats["excluded"]
+        return assigned
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
@@ -0,0 +1,179 @@
+"""
+Persistent memo of Perplexity topic syntheses.
+
+The chat/completions synthesis is the slowest Perplexity call, and when a
+topic's search results haven't changed since an earlier run it produces
+the same research again. Syntheses are memoized on a fingerprint of the
+topic, the ordered result URLs and snippets, the model and the prompt
+version, in the synthesis_memo table with an in-memory LRU in front.
+Rows older than settings.synthesis_memo_retention_days are ignored and
+periodically deleted, which keeps the table bounded.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import get_settings
+
+# Delete expired rows at most this often
+PRUNE_INTERVAL_SECONDS = 60 * 60
+
+
+def synthesis_fingerprint(
+    topic: str,
+    results: List[Dict[str, Any]],
+    model: str,
+    prompt_version: str,
+) -> str:
+    """Stable hash of everything a topic's synthesis depends on."""
+    payload = json.dumps(
+        {
+            "topic": topic,
+            "model": model,
+            "prompt_version": prompt_version,
+            "results": [[result.get("url", ""), result.get("snippet", "")] for result in results],
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SynthesisMemo:
+    """Two-level (memory LRU + Supabase) memo of syntheses by fingerprint."""
+
+    def __init__(self, max_entries: Optional[int] = None, retention_days: Optional[int] = None):
+        """
+        Initialize the memo.
+
+        Args:
+            max_entries: In-memory LRU size. Defaults to settings.synthesis_memo_max_entries.
+            retention_days: How long memoized syntheses are reused and kept.
+                Defaults to settings.synthesis_memo_retention_days.
+        """
+        self._max_entries = max_entries
+        self._retention_days = retention_days
+        self._entries: "OrderedDict[str, Tuple[datetime, str]]" = OrderedDict()
+        self._last_pruned: Optional[float] = None
+        self._stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stored": 0, "errors": 0}
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is None:
+            self._max_entries = get_settings().synthesis_memo_max_entries
+        return self._max_entries
+
+    @property
+    def retention(self) -> timedelta:
+        if self._retention_days is None:
+            self._retention_days = get_settings().synthesis_memo_retention_days
+        return timedelta(days=self._retention_days)
+
+    def _remember(self, fingerprint: str, created_at: datetime, summary: str) -> None:
+        self._entries[fingerprint] = (created_at, summary)
+        self._entries.move_to_end(fingerprint)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, fingerprints: List[str]) -> Dict[str, str]:
+        """
+        Look up memoized syntheses.
+
+        Checks memory first and fetches the rest with one query. Database
+        errors are treated as misses.
+
+        Returns fingerprint -> summary for the ones found.
+        """
+        since = datetime.utcnow() - self.retention
+        found: Dict[str, str] = {}
+        missing = []
+
+        for fingerprint in dict.fromkeys(fingerprints):
+            cached = self._entries.get(fingerprint)
+            if cached is not None and cached[0] >= since:
+                self._entries.move_to_end(fingerprint)
+                found[fingerprint] = cached[1]
+                self._stats["memory_hits"] += 1
+            else:
+                missing.append(fingerprint)
+
+        if missing:
+            from app.services import db
+
+            try:
+                rows = db.get_synthesis_memos(missing, since)
+            except Exception as e:
+                print(f"[SYNTHESIS MEMO] Lookup failed: {str(e)}")
+                self._stats["errors"] += 1
+                rows = []
+
+            for row in rows:
+                found[row["fingerprint"]] = row["summary"]
+                self._remember(row["fingerprint"], db.parse_timestamp(row["created_at"]), row["summary"])
+                self._stats["db_hits"] += 1
+            self._stats["misses"] += len(missing) - len(rows)
+
+        return found
+
+    def put_many(self, entries: Dict[str, Tuple[str, str]], prompt_version: str) -> None:
+        """
+        Memoize syntheses.
+
+        Args:
+            entries: fingerprint -> (topic, summary)
+            prompt_version: Prompt version the syntheses were made with
+        """
+        if not entries:
+            return
+
+        now = datetime.utcnow()
+        for fingerprint, (_, summary) in entries.items():
+            self._remember(fingerprint, now, summary)
+
+        from app.services import db
+
+        try:
+            db.add_synthesis_memos([
+                {
+                    "fingerprint": fingerprint,
+                    "topic": topic,
+                    "summary": summary,
+                    "prompt_version": prompt_version,
+                    "created_at": now.isoformat() + "Z",
+                }
+                for fingerprint, (topic, summary) in entries.items()
+            ])
+            self._stats["stored"] += len(entries)
+        except Exception as e:
+            print(f"[SYNTHESIS MEMO] Failed to store {len(entries)} syntheses: {str(e)}")
+            self._stats["errors"] += 1
+
+        self._prune_if_due()
+
+    def _prune_if_due(self) -> None:
+        """Delete expired rows, at most once per PRUNE_INTERVAL_SECONDS."""
+        if self._last_pruned is not None and time.monotonic() - self._last_pruned < PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_pruned = time.monotonic()
+
+        from app.services import db
+
+        try:
+            deleted = db.delete_synthesis_memos_before(datetime.utcnow() - self.retention)
+            if deleted:
+                print(f"[SYNTHESIS MEMO] Deleted {deleted} expired syntheses")
+        except Exception as e:
+            print(f"[SYNTHESIS MEMO] Cleanup failed: {str(e)}")
+            self._stats["errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counts and in-memory size."""
+        return {**self._stats, "size": len(self._entries), "max_entries": self.max_entries}
+
+
+# Global instance
+synthesis_memo = SynthesisMemo()
@@ -0,0 +1,168 @@
+"""
+HTML-to-text normalization for feed content.
+
+Feed entries carry HTML in both `summary` and `content`, and the summary
+is usually a truncated copy of the content. Before uploading entries to
+NotebookLM we convert them to plain text, drop scripts, styles and common
+boilerplate, remove the duplicated summary text and collapse whitespace,
+so sources are smaller without losing article text.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import List, Tuple
+
+# Elements whose content is never article text
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "iframe", "object",
+    "svg", "canvas", "form", "button", "select", "nav", "footer", "aside",
+}
+
+# Elements without an end tag (or content), which never open a block or a skip
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+}
+
+# Elements that start a new paragraph / line in the text output
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "header", "main", "blockquote", "pre",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "dl", "dt", "dd",
+    "table", "tr", "figure", "figcaption", "hr",
+}
+
+# Lines that are feed / CMS boilerplate rather than article text
+BOILERPLATE_PATTERNS = [
+    re.compile(r"^the post .+ appeared first on .+\.?$", re.IGNORECASE),
+    re.compile(r"^(continue|keep) reading\b.*$", re.IGNORECASE),
+    re.compile(r"^read (the )?(full|more|rest)\b.*$", re.IGNORECASE),
+    re.compile(r"^(share|like) this:?$", re.IGNORECASE),
+    re.compile(r"^(click here|subscribe) to .*(subscribe|newsletter|updates).*$", re.IGNORECASE),
+    re.compile(r"^(\[(…|\.\.\.)\]|…|\.\.\.)$"),
+]
+
+# Trailing truncation markers on feed summaries ("... [&#8230;]", "Read more")
+TRUNCATION_SUFFIX = re.compile(r"\s*(\[(…|\.\.\.)\]|…|\.\.\.|read more|continue reading)\s*$", re.IGNORECASE)
+
+
+class _TextExtractor(HTMLParser):
+    """
+    Collects text outside SKIP_TAGS.
+
+    A skipped element that is never closed (malformed feed HTML) only hides
+    text until the block element it was opened in closes, so one bad tag
+    can't swallow the rest of an article.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._blocks: List[str] = []  # Open block elements
+        self._skips: List[Tuple[str, int]] = []  # Open skipped elements with the block depth they opened at
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            self.handle_startendtag(tag, attrs)
+            return
+        if tag in BLOCK_TAGS:
+            self._blocks.append(tag)
+
+        if tag in SKIP_TAGS:
+            self._skips.append((tag, len(self._blocks)))
+        elif tag == "br":
+            self.parts.append("\n")
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n\n")
+            if tag == "li" and not self._skips:
+                self.parts.append("- ")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == "br":
+            self.parts.append("\n")
+        elif tag == "hr":
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            for index in range(len(self._skips) - 1, -1, -1):
+                if self._skips[index][0] == tag:
+                    del self._skips[index:]
+                    break
+        elif tag in BLOCK_TAGS:
+            if tag in self._blocks:
+                # Also closes any block left open inside it
+                del self._blocks[len(self._blocks) - 1 - self._blocks[::-1].index(tag):]
+                # Skipped elements opened inside the closed block end with it
+                while self._skips and self._skips[-1][1] > len(self._blocks):
+                    self._skips.pop()
+            self.parts.append("\n\n")
+
+    def handle_data(self, data):
+        if not self._skips:
+            self.parts.append(data)
+
+
+def collapse_whitespace(text: str) -> str:
+    """Collapse runs of spaces within lines and of blank lines between paragraphs."""
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    text = "\n".join(lines)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def html_to_text(html: str) -> str:
+    """Convert an HTML fragment to plain text paragraphs without boilerplate."""
+    if not html:
+        return ""
+
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+
+    paragraphs = []
+    for paragraph in collapse_whitespace("".join(extractor.parts)).split("\n\n"):
+        lines = [
+            line for line in paragraph.split("\n")
+            if line and not any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS)
+        ]
+        if lines:
+            paragraphs.append("\n".join(lines))
+
+    return "\n\n".join(paragraphs)
+
+
+def _comparable(text: str) -> str:
+    """Lowercased words only, for duplicate detection."""
+    return " ".join(re.findall(r"\w+", TRUNCATION_SUFFIX.sub("", text).lower()))
+
+
+def merge_summary_and_content(summary_html: str, content_html: str) -> str:
+    """
+    Combine an entry's summary and content as plain text without repeats.
+
+    If one is contained in the other (the usual truncated-summary case) only
+    the longer one is kept; otherwise paragraphs already present are dropped.
+    """
+    summary = html_to_text(summary_html)
+    content = html_to_text(content_html)
+
+    if not summary or not content:
+        return summary or content
+
+    summary_key = _comparable(summary)
+    content_key = _comparable(content)
+
+    if summary_key in content_key:
+        return content
+    if content_key in summary_key:
+        return summary
+
+    merged = []
+    seen = set()
+    for paragraph in summary.split("\n\n") + content.split("\n\n"):
+        key = _comparable(paragraph)
+        if key and key in seen:
+            continue
+        seen.add(key)
+        merged.append(paragraph)
+
+    return "\n\n".join(merged)
@@ -0,0 +1,187 @@
+"""
+Cross-user TTL cache for Perplexity topic searches.
+
+Popular topics ("AI", "stock market") are requested by many users in the
+same morning run. Search results are cached per normalized topic and
+recency window for settings.topic_cache_ttl_seconds (empty results, i.e.
+"no recent news", only for settings.topic_cache_empty_ttl_seconds), and
+concurrent misses for the same key share one in-flight request
+(single-flight) instead of each calling Perplexity.
+"""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import get_settings
+
+# Set on an in-flight future whose leader was cancelled; waiters retry
+_ABANDONED = object()
+
+
+def normalize_topic(topic: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    return " ".join(re.findall(r"\w+", topic.lower()))
+
+
+class TopicResultCache:
+    """TTL + LRU cache of topic results with in-flight request coalescing."""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        empty_ttl_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: How long results stay fresh. Defaults to
+                settings.topic_cache_ttl_seconds.
+            max_entries: Maximum cached results. Defaults to
+                settings.topic_cache_max_entries.
+            empty_ttl_seconds: How long empty results stay fresh. Defaults
+                to settings.topic_cache_empty_ttl_seconds.
+        """
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._empty_ttl_seconds = empty_ttl_seconds
+        self._values: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (expires_at, value)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0, "abandoned": 0}
+
+    @property
+    def ttl_seconds(self) -> float:
+        if self._ttl_seconds is None:
+            self._ttl_seconds = get_settings().topic_cache_ttl_seconds
+        return self._ttl_seconds
+
+    @property
+    def empty_ttl_seconds(self) -> float:
+        if self._empty_ttl_seconds is None:
+            self._empty_ttl_seconds = get_settings().topic_cache_empty_ttl_seconds
+        return self._empty_ttl_seconds
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is None:
+            self._max_entries = get_settings().topic_cache_max_entries
+        return self._max_entries
+
+    @staticmethod
+    def make_key(topic: str, recency: str) -> str:
+        return f"{recency}:{normalize_topic(topic)}"
+
+    def _fresh_value(self, key: str) -> Tuple[bool, Any]:
+        cached = self._values.get(key)
+        if cached is None:
+            return False, None
+        expires_at, value = cached
+        if time.monotonic() > expires_at:
+            del self._values[key]
+            return False, None
+        self._values.move_to_end(key)
+        return True, value
+
+    def lookup(self, key: str) -> Tuple[bool, Any, Optional[asyncio.Future]]:
+        """
+        Check the cache without starting any work.
+
+        Returns (found, value, inflight): found/value for a fresh cached
+        result, or the future of a request already running for this key.
+        """
+        found, value = self._fresh_value(key)
+        if found:
+            self._stats["hits"] += 1
+            return True, value, None
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._stats["coalesced"] += 1
+        return False, None, inflight
+
+    def claim(self, key: str) -> asyncio.Future:
+        """
+        Mark `key` as being computed by the caller.
+
+        Other callers will wait on the returned future. The caller must
+        finish with resolve(), fail() or abandon().
+        """
+        self._stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    def resolve(self, key: str, value: Any) -> None:
+        """Store a computed value and wake everyone waiting on it."""
+        # Empty results ("no recent news") go stale quickly
+        ttl = self.ttl_seconds if value else self.empty_ttl_seconds
+        self._values[key] = (time.monotonic() + ttl, value)
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+
+        future = self._inflight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(value)
+
+    def fail(self, key: str, error: BaseException) -> None:
+        """Propagate a failure to waiters without caching it."""
+        self._stats["errors"] += 1
+        future = self._inflight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_exception(error)
+            # Mark retrieved so asyncio doesn't warn when nobody else was waiting
+            future.exception()
+
+    def abandon(self, key: str) -> None:
+        """Give up a claim without a result (e.g. the caller was cancelled); waiters retry."""
+        self._stats["abandoned"] += 1
+        future = self._inflight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(_ABANDONED)
+
+    async def get_or_create(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for `key`, computing it at most once concurrently.
+
+        If the caller computing it is cancelled, one of its waiters takes
+        over instead of all of them being cancelled too.
+        """
+        while True:
+            found, value, inflight = self.lookup(key)
+            if found:
+                return value
+            if inflight is None:
+                break
+            value = await asyncio.shield(inflight)
+            if value is not _ABANDONED:
+                return value
+
+        self.claim(key)
+        try:
+            value = await factory()
+        except Exception as e:
+            self.fail(key, e)
+            raise
+        except BaseException:
+            self.abandon(key)
+            raise
+        self.resolve(key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/coalesced counts and current size."""
+        return {
+            **self._stats,
+            "size": len(self._values),
+            "inflight": len(self._inflight),
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# Global instance
+topic_cache = TopicResultCache()
@@ -0,0 +1,109 @@
+"""
+Topic equivalence for news topics.
+
+Users add overlapping topics ("AI", "Artificial Intelligence", "AI news"),
+and each one costs a search and a synthesis. A topic's key is its set of
+words, normalized, with filler words like "news" dropped, plurals folded,
+and common abbreviations and their spelled-out forms folded into one alias
+token. Topics with the same key are researched once, within a user's run
+and across users (the key is the topic cache key); anything beyond that,
+such as "AI" vs "AI Act", stays a separate topic.
+"""
+
+import re
+from typing import Dict, FrozenSet, List, Tuple
+
+# Words that don't change what a topic is about
+FILLER_WORDS = {
+    "news", "latest", "recent", "update", "updates", "today", "daily",
+    "headlines", "developments", "the", "a", "an", "about", "on", "in", "of",
+    "and", "what", "s", "happening",
+}
+
+# Abbreviations and their spelled-out forms (kept conservative on purpose)
+ALIASES = {
+    "ai": "artificial intelligence",
+    "ml": "machine learning",
+    "llm": "large language model",
+    "llms": "large language model",
+    "genai": "generative artificial intelligence",
+    "ev": "electric vehicle",
+    "evs": "electric vehicle",
+    "crypto": "cryptocurrency",
+    "btc": "bitcoin",
+    "eth": "ethereum",
+    "nba": "national basketball association",
+    "nfl": "national football league",
+    "f1": "formula 1",
+    "vr": "virtual reality",
+    "ar": "augmented reality",
+}
+
+
+def _stem(token: str) -> str:
+    """Fold simple plurals ("vehicles" -> "vehicle")."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+# Spelled-out form (stemmed words) -> alias token, longest forms first so
+# "generative artificial intelligence" wins over "artificial intelligence"
+_ALIAS_PHRASES: Dict[Tuple[str, ...], str] = {}
+for _abbreviation, _expansion in ALIASES.items():
+    _ALIAS_PHRASES.setdefault(tuple(_stem(word) for word in _expansion.split()), _abbreviation)
+_ALIAS_PHRASES = dict(sorted(_ALIAS_PHRASES.items(), key=lambda item: -len(item[0])))
+
+
+def _fold_aliases(words: List[str]) -> List[str]:
+    """Replace each spelled-out alias phrase with its alias token."""
+    folded = []
+    i = 0
+    while i < len(words):
+        for phrase, alias in _ALIAS_PHRASES.items():
+            if tuple(words[i:i + len(phrase)]) == phrase:
+                folded.append(alias)
+                i += len(phrase)
+                break
+        else:
+            folded.append(words[i])
+            i += 1
+    return folded
+
+
+def topic_words(topic: str) -> FrozenSet[str]:
+    """Comparison words of a topic: normalized, alias-folded, de-filled and stemmed."""
+    tokens = re.findall(r"\w+", topic.lower())
+    # Topic made only of filler ("Latest news") - compare as typed
+    tokens = [token for token in tokens if token not in FILLER_WORDS] or tokens
+
+    words = []
+    for token in tokens:
+        # Spell abbreviations out so "GenAI" and "generative AI" fold the same way
+        words.extend(_stem(word) for word in ALIASES.get(token, token).split())
+    return frozenset(_fold_aliases(words))
+
+
+def topic_key(topic: str) -> str:
+    """
+    Canonical key of a topic: its comparison words, sorted.
+
+    Topics with the same key are the same topic ("AI news", "Artificial
+    Intelligence"); the key is shared across users.
+    """
+    return " ".join(sorted(topic_words(topic)))
+
+
+def group_topics(topics: List[str]) -> Dict[str, List[str]]:
+    """
+    Merge equivalent topics.
+
+    Returns topic key (see topic_key) -> the given topics with that key, in
+    the order the keys first appear in `topics`.
+    """
+    groups: Dict[str, List[str]] = {}
+    for topic in topics:
+        groups.setdefault(topic_key(topic), []).append(topic)
+    return groups
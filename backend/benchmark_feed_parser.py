@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming first-entry feed parser against feedparser.
+
+Builds synthetic RSS and Atom feeds of increasing size and times:
+- feedparser: parse the whole document, keep the newest entry (old path)
+- stream: StreamingFeedParser fed 64 KB chunks, stopping at the newest entry
+
+First checks that both parsers agree on the fields entries are keyed and
+linked by (title, link, guid, published) for a few tricky feed shapes.
+
+Run from the backend directory:
+    python benchmark_feed_parser.py
+"""
+import statistics
+import time
+
+import feedparser
+
+from app.services.feed_stream import StreamingFeedParser
+from app.services.rss import parse_feed_content
+
+CHUNK_SIZE = 64 * 1024
+ROUNDS = 5
+
+PARAGRAPH = "<p>" + ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20) + "</p>"
+
+
+def build_rss(items: int) -> bytes:
+    body = "".join(
+        f"<item><title>Story {i}</title><link>https://example.com/{i}</link>"
+        f"<guid>https://example.com/{i}</guid>"
+        f"<pubDate>Mon, 06 Jan 2025 10:00:00 GMT</pubDate>"
+        f"<description><![CDATA[{PARAGRAPH}]]></description>"
+        f"<content:encoded><![CDATA[{PARAGRAPH * 5}]]></content:encoded></item>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        f"<channel><title>Bench</title>{body}</channel></rss>"
+    ).encode("utf-8")
+
+
+def build_atom(items: int) -> bytes:
+    body = "".join(
+        f'<entry><title>Story {i}</title><link rel="alternate" href="https://example.com/{i}"/>'
+        f"<id>urn:story:{i}</id><updated>2025-01-06T10:00:00Z</updated>"
+        f'<summary type="html"><![CDATA[{PARAGRAPH}]]></summary>'
+        f'<content type="html"><![CDATA[{PARAGRAPH * 5}]]></content></entry>'
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        f'<feed xmlns="http://www.w3.org/2005/Atom"><title>Bench</title>{body}</feed>'
+    ).encode("utf-8")
+
+
+# Feeds where a namespace-blind parser picks the wrong element or identity
+PARITY_CASES = {
+    # <atom:link rel="self"/> before the item's own <link>
+    "rss2 atom:link": (
+        '<?xml version="1.0"?><rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+        "<title>T</title><item><atom:link rel=\"self\" href=\"https://example.com/feed\"/>"
+        "<title>Story</title><link>https://example.com/story</link><guid>story-1</guid>"
+        "<pubDate>Mon, 06 Jan 2025 10:00:00 GMT</pubDate></item></channel></rss>"
+    ),
+    # RSS 1.0: namespaced items identified by rdf:about, no <guid>
+    "rss1 rdf:about": (
+        '<?xml version="1.0"?><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+        'xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        '<channel rdf:about="https://example.com/"><title>T</title></channel>'
+        '<item rdf:about="https://example.com/story"><title>Story</title>'
+        "<link>https://example.com/story?from=rss</link><dc:date>2025-01-06T10:00:00Z</dc:date></item></rdf:RDF>"
+    ),
+    # Atom with a non-alternate link first
+    "atom rel=self": (
+        '<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>T</title>'
+        '<entry><link rel="self" href="https://example.com/entry.xml"/>'
+        '<link rel="alternate" href="https://example.com/story"/><title>Story</title>'
+        "<id>urn:story:1</id><updated>2025-01-06T10:00:00Z</updated></entry></feed>"
+    ),
+}
+
+PARITY_FIELDS = ("title", "link", "guid", "published")
+
+
+def check_parity():
+    for name, document in PARITY_CASES.items():
+        expected = parse_feed_content(document.encode("utf-8"))[0]
+        parser = StreamingFeedParser(max_entries=1)
+        parser.feed(document.encode("utf-8"))
+        actual = parser.close()[0]
+        for field in PARITY_FIELDS:
+            assert actual[field] == expected[field], (
+                f"{name}: {field} mismatch: stream {actual[field]!r} != feedparser {expected[field]!r}"
+            )
+        print(f"parity ok: {name}")
+
+
+def run_feedparser(document: bytes):
+    feed = feedparser.parse(document)
+    return feed.entries[0].get("title"), len(document)
+
+
+def run_stream(document: bytes):
+    parser = StreamingFeedParser(max_entries=1)
+    consumed = 0
+    for start in range(0, len(document), CHUNK_SIZE):
+        chunk = document[start:start + CHUNK_SIZE]
+        consumed += len(chunk)
+        if parser.feed(chunk):
+            break
+    return parser.close()[0]["title"], consumed
+
+
+def time_it(func, document: bytes):
+    timings = []
+    result = None
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = func(document)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    check_parity()
+    print()
+    print(f"{'feed':<12}{'size':>10}  {'feedparser':>12}  {'stream':>10}  {'bytes read':>11}  {'speedup':>8}")
+    for name, builder in (("rss", build_rss), ("atom", build_atom)):
+        for items in (10, 100, 1000):
+            document = builder(items)
+            old_ms, (old_title, _) = time_it(run_feedparser, document)
+            new_ms, (new_title, consumed) = time_it(run_stream, document)
+            assert old_title == new_title, f"first entry mismatch: {old_title!r} != {new_title!r}"
+            print(
+                f"{name + ' x' + str(items):<12}{len(document) // 1024:>8}KB"
+                f"  {old_ms:>10.1f}ms  {new_ms:>8.1f}ms  {consumed // 1024:>9}KB"
+                f"  {old_ms / new_ms:>7.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+-- Migration: Track NotebookLM audio generation as durable jobs
+-- Run this in Supabase SQL editor to update existing tables
+
+CREATE TABLE IF NOT EXISTS audio_jobs (
+  id uuid DEFAULT uuid_generate_v4() PRIMARY KEY,
+  generation_id uuid REFERENCES generation_logs(id) ON DELETE CASCADE NOT NULL UNIQUE,
+  user_id uuid REFERENCES auth.users(id) ON DELETE CASCADE NOT NULL,
+  notebook_id text NOT NULL,
+  task_id text,  -- NotebookLM task, set once generation has started
+  format text DEFAULT 'deep-dive',
+  status text CHECK (status IN ('pending', 'generating', 'complete', 'failed', 'timeout')) DEFAULT 'pending',
+  attempts integer DEFAULT 0 NOT NULL,
+  audio_url text,
+  error text,
+  started_at timestamp with time zone,
+  completed_at timestamp with time zone,
+  created_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL,
+  updated_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- Unfinished jobs are resumed on startup
+CREATE INDEX IF NOT EXISTS idx_audio_jobs_status ON audio_jobs(status);
+
+-- Only accessed with the service key
+ALTER TABLE audio_jobs ENABLE ROW LEVEL SECURITY;
+
+-- Audio outcome on the generation itself
+ALTER TABLE generation_logs
+  ADD COLUMN IF NOT EXISTS audio_status text,
+  ADD COLUMN IF NOT EXISTS audio_url text,
+  ADD COLUMN IF NOT EXISTS audio_generation_seconds double precision;
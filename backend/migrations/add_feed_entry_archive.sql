@@ -0,0 +1,32 @@
+-- Migration: Add persistent feed-entry archive and per-user generation cursors
+-- Run this in Supabase SQL editor to update existing tables
+
+-- Every entry we've fetched, once per (canonical) feed URL
+CREATE TABLE IF NOT EXISTS feed_entries (
+  id uuid DEFAULT uuid_generate_v4() PRIMARY KEY,
+  feed_url text NOT NULL,
+  entry_key text NOT NULL,  -- "guid:<guid>" or "sha256:<content hash>"
+  title text,
+  link text,
+  published_at timestamp with time zone,
+  first_seen_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL,
+  UNIQUE(feed_url, entry_key)
+);
+
+-- Last successful generation per user
+CREATE TABLE IF NOT EXISTS generation_cursors (
+  id uuid DEFAULT uuid_generate_v4() PRIMARY KEY,
+  user_id uuid REFERENCES auth.users(id) ON DELETE CASCADE NOT NULL UNIQUE,
+  last_generation_id uuid REFERENCES generation_logs(id) ON DELETE SET NULL,
+  last_generated_at timestamp with time zone,
+  updated_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- feed_entries is shared across users and only accessed with the service key
+ALTER TABLE feed_entries ENABLE ROW LEVEL SECURITY;
+ALTER TABLE generation_cursors ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own generation_cursors" ON generation_cursors FOR SELECT USING (auth.uid() = user_id);
+
+-- (feed_url, entry_key) lookups use the unique index; this one serves per-feed recency scans
+CREATE INDEX IF NOT EXISTS idx_feed_entries_feed_first_seen ON feed_entries(feed_url, first_seen_at DESC);
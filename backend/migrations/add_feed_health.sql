@@ -0,0 +1,18 @@
+-- Migration: Add per-feed health tracking for the feed circuit breaker
+-- Run this in Supabase SQL editor to update existing tables
+
+CREATE TABLE IF NOT EXISTS feed_health (
+  id uuid DEFAULT uuid_generate_v4() PRIMARY KEY,
+  feed_url text NOT NULL UNIQUE,  -- canonical feed URL
+  status text CHECK (status IN ('healthy', 'degraded', 'open')) DEFAULT 'healthy',
+  consecutive_failures integer DEFAULT 0 NOT NULL,
+  last_latency_ms double precision,
+  last_success_at timestamp with time zone,
+  last_failure_at timestamp with time zone,
+  last_error text,
+  next_retry_at timestamp with time zone,
+  updated_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- Shared across users and only accessed with the service key
+ALTER TABLE feed_health ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,8 @@
+-- Migration: Record Perplexity usage (requests, tokens, latency, cost) per generation
+-- Run this in Supabase SQL editor to update existing tables
+
+ALTER TABLE generation_logs
+  ADD COLUMN IF NOT EXISTS perplexity_usage jsonb;
+
+-- Admin usage reports scan recent generations
+CREATE INDEX IF NOT EXISTS idx_generation_logs_created_at ON generation_logs(created_at);
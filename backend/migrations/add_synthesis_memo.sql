@@ -0,0 +1,17 @@
+-- Migration: Add persistent memo of Perplexity topic syntheses
+-- Run this in Supabase SQL editor to update existing tables
+
+CREATE TABLE IF NOT EXISTS synthesis_memo (
+  id uuid DEFAULT uuid_generate_v4() PRIMARY KEY,
+  fingerprint text NOT NULL UNIQUE,  -- hash of prompt version, topic and ordered search results
+  topic text NOT NULL,
+  summary text NOT NULL,
+  prompt_version text NOT NULL,
+  created_at timestamp with time zone DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- Retention cleanup deletes by age
+CREATE INDEX IF NOT EXISTS idx_synthesis_memo_created_at ON synthesis_memo(created_at);
+
+-- Shared across users and only accessed with the service key
+ALTER TABLE synthesis_memo ENABLE ROW LEVEL SECURITY;
@@ -50,9 +50,76 @@ create table generation_logs (
   notebook_id text,
   sources_used jsonb,
   error_message text,
+  perplexity_usage jsonb,
+  audio_status text,
+  audio_url text,
+  audio_generation_seconds double precision,
   created_at timestamp with time zone default timezone('utc'::text, now()) not null
 );
 
+-- Feed Entry Archive (shared across users, keyed by canonical feed URL)
+create table feed_entries (
+  id uuid default uuid_generate_v4() primary key,
+  feed_url text not null,
+  entry_key text not null,
+  title text,
+  link text,
+  published_at timestamp with time zone,
+  first_seen_at timestamp with time zone default timezone('utc'::text, now()) not null,
+  unique(feed_url, entry_key)
+);
+
+-- Feed Health (circuit breaker state, keyed by canonical feed URL)
+create table feed_health (
+  id uuid default uuid_generate_v4() primary key,
+  feed_url text not null unique,
+  status text check (status in ('healthy', 'degraded', 'open')) default 'healthy',
+  consecutive_failures integer default 0 not null,
+  last_latency_ms double precision,
+  last_success_at timestamp with time zone,
+  last_failure_at timestamp with time zone,
+  last_error text,
+  next_retry_at timestamp with time zone,
+  updated_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
+-- Synthesis Memo (Perplexity syntheses keyed by search-result fingerprint)
+create table synthesis_memo (
+  id uuid default uuid_generate_v4() primary key,
+  fingerprint text not null unique,
+  topic text not null,
+  summary text not null,
+  prompt_version text not null,
+  created_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
+-- Audio Jobs (NotebookLM audio generation, resumed after restarts)
+create table audio_jobs (
+  id uuid default uuid_generate_v4() primary key,
+  generation_id uuid references generation_logs(id) on delete cascade not null unique,
+  user_id uuid references auth.users(id) on delete cascade not null,
+  notebook_id text not null,
+  task_id text,
+  format text default 'deep-dive',
+  status text check (status in ('pending', 'generating', 'complete', 'failed', 'timeout')) default 'pending',
+  attempts integer default 0 not null,
+  audio_url text,
+  error text,
+  started_at timestamp with time zone,
+  completed_at timestamp with time zone,
+  created_at timestamp with time zone default timezone('utc'::text, now()) not null,
+  updated_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
+-- Generation Cursors (last successful generation per user)
+create table generation_cursors (
+  id uuid default uuid_generate_v4() primary key,
+  user_id uuid references auth.users(id) on delete cascade not null unique,
+  last_generation_id uuid references generation_logs(id) on delete set null,
+  last_generated_at timestamp with time zone,
+  updated_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
 -- User Credentials (encrypted OAuth tokens)
 create table user_credentials (
   id uuid default uuid_generate_v4() primary key,
@@ -85,6 +152,11 @@ alter table news_topics enable row level security;
 alter table generation_logs enable row level security;
 alter table user_credentials enable row level security;
 alter table user_preferences enable row level security;
+alter table feed_entries enable row level security;
+alter table generation_cursors enable row level security;
+alter table feed_health enable row level security;
+alter table synthesis_memo enable row level security;
+alter table audio_jobs enable row level security;
 
 -- Users can only access their own data
 create policy "Users can view own substack_sources" on substack_sources for select using (auth.uid() = user_id);
@@ -110,6 +182,8 @@ create policy "Users can view own user_credentials" on user_credentials for sele
 create policy "Users can insert own user_credentials" on user_credentials for insert with check (auth.uid() = user_id);
 create policy "Users can update own user_credentials" on user_credentials for update using (auth.uid() = user_id);
 
+create policy "Users can view own generation_cursors" on generation_cursors for select using (auth.uid() = user_id);
+
 create policy "Users can view own user_preferences" on user_preferences for select using (auth.uid() = user_id);
 create policy "Users can insert own user_preferences" on user_preferences for insert with check (auth.uid() = user_id);
 create policy "Users can update own user_preferences" on user_preferences for update using (auth.uid() = user_id);
@@ -121,3 +195,7 @@ create index idx_rss_sources_user_id on rss_sources(user_id);
 create index idx_news_topics_user_id on news_topics(user_id);
 create index idx_generation_logs_user_id on generation_logs(user_id);
 create index idx_generation_logs_status on generation_logs(status);
+create index idx_generation_logs_created_at on generation_logs(created_at);
+create index idx_feed_entries_feed_first_seen on feed_entries(feed_url, first_seen_at desc);
+create index idx_synthesis_memo_created_at on synthesis_memo(created_at);
+create index idx_audio_jobs_status on audio_jobs(status);
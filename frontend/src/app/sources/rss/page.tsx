@@ -7,11 +7,20 @@ import Link from "next/link";
 import { getRssSources, addRssSource, deleteRssSource } from "@/lib/api";
 import { useAuth } from "@/lib/auth-context";
 
+interface FeedHealth {
+  status: "healthy" | "degraded" | "open";
+  consecutive_failures: number;
+  last_success_at: string | null;
+  last_error: string | null;
+  next_retry_at: string | null;
+}
+
 interface RssSource {
   id: string;
   url: string;
   name: string;
   enabled: boolean;
+  health: FeedHealth | null;
 }
 
 export default function RssPage() {
@@ -144,6 +153,22 @@ export default function RssPage() {
                   <p className="text-sm text-gray-700 truncate max-w-md">
                     {source.url}
                   </p>
+                  {source.health && source.health.status !== "healthy" && (
+                    <p
+                      className={`text-xs mt-1 ${
+                        source.health.status === "open"
+                          ? "text-red-600"
+                          : "text-yellow-700"
+                      }`}
+                      title={source.health.last_error || undefined}
+                    >
+                      {source.health.status === "open"
+                        ? `Feed is failing and is being skipped (${source.health.consecutive_failures} failures in a row)`
+                        : `Last fetch failed (${source.health.consecutive_failures} failure${
+                            source.health.consecutive_failures === 1 ? "" : "s"
+                          })`}
+                    </p>
+                  )}
                 </div>
                 <button
                   onClick={() => deleteMutation.mutate(source.id)}